@@ -9,6 +9,7 @@ through this interface.
 
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
+import numpy as np
 import pandas as pd
 
 
@@ -72,3 +73,22 @@ class BaseDataDomain(ABC):
     def get_tool_names(self) -> List[str]:
         """Convenience: list of tool name strings owned by this domain."""
         return [t["name"] for t in self.get_tool_definitions()]
+
+    @staticmethod
+    def _top_n(df: pd.DataFrame, col: str, n: int) -> pd.DataFrame:
+        """Rows with the ``n`` largest values in ``col``, descending.
+
+        For small ``n`` relative to the frame this selects via
+        ``np.argpartition`` (linear time) and sorts only the selected rows,
+        instead of ``nlargest``'s full-column sort.  Missing values rank last.
+        """
+        if n >= len(df):
+            return df.sort_values(col, ascending=False, na_position="last")
+        if n < len(df) // 8:
+            values = pd.to_numeric(df[col], errors="coerce").to_numpy(
+                dtype="float64", na_value=float("-inf")
+            )
+            idx = np.argpartition(-values, n)[:n]
+            idx = idx[np.argsort(-values[idx], kind="stable")]
+            return df.iloc[idx]
+        return df.nlargest(n, col)
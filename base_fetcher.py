@@ -7,12 +7,15 @@ Subclass for each dataset/domain (homicides, census, property, etc.).
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from abc import ABC, abstractmethod
 import os
 
@@ -20,6 +23,16 @@ import os
 class BaseSocrataFetcher(ABC):
     """Base class for Socrata open-data API fetchers with caching."""
 
+    # Natural primary key of the dataset, e.g. ("community_area", "acs_year").
+    # When set, deduplication hashes only these columns instead of every
+    # value in every row.
+    PRIMARY_KEY: Optional[Tuple[str, ...]] = None
+
+    # Parquet cache knobs — subclasses may override, e.g. a query-heavy
+    # domain can pick zstd and Arrow-backed frames on load.
+    PARQUET_COMPRESSION = "snappy"
+    PARQUET_DTYPE_BACKEND: Optional[str] = None
+
     def __init__(
         self,
         dataset_id: str,
@@ -33,30 +46,68 @@ class BaseSocrataFetcher(ABC):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # Shared HTTP session: keep-alive and pooled connections skip the
+        # per-request TLS handshake; gzip shrinks JSON payloads on the wire.
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(
+                    total=5,
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                ),
+            ),
+        )
+        self._session.headers.update({"Accept-Encoding": "gzip, deflate"})
+
         # Pagination defaults (subclasses may override)
         self.batch_size = 10000
         self.max_limit = 50000
+        # Bounded concurrency for paginated fetches — keeps us polite to the
+        # Socrata API while overlapping HTTP round trips.
+        self.max_concurrent_fetches = 4
 
-        # Cache settings
+        # Cache settings — stored as Parquet (Snappy), far faster to read/write
+        # than CSV and preserves dtypes so numeric columns need no reparse.
         self.cache_expiry_hours = cache_expiry_hours
-        fname = cache_filename or f"{dataset_id.replace('-', '_')}_cache.csv"
-        self.cache_file = self.cache_dir / fname
+        fname = cache_filename or f"{dataset_id.replace('-', '_')}_cache.parquet"
+        self.cache_file = (self.cache_dir / fname).with_suffix(".parquet")
+        # Legacy CSV cache location (pre-Parquet) — migrated on first load
+        self.legacy_cache_file = self.cache_file.with_suffix(".csv")
         self.metadata_file = self.cache_dir / f"{Path(fname).stem}_metadata.json"
+        # ETag + count from the last count(*) request, for conditional GETs
+        self.count_state_file = self.cache_dir / f"{Path(fname).stem}_count.json"
 
     # ------------------------------------------------------------------
     # Caching
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _now(reference: Optional[datetime] = None) -> datetime:
+        """Current time, timezone-aware (UTC).
+
+        Falls back to naive local time when comparing against a legacy
+        naive cache timestamp so old metadata files stay readable.
+        """
+        if reference is not None and reference.tzinfo is None:
+            return datetime.now()
+        return datetime.now(timezone.utc)
+
     def is_cache_valid(self) -> bool:
         """Check if cached data is still valid (not expired)."""
-        if not self.cache_file.exists() or not self.metadata_file.exists():
+        if not (self.cache_file.exists() or self.legacy_cache_file.exists()):
+            return False
+        if not self.metadata_file.exists():
             return False
         try:
             with open(self.metadata_file, "r") as f:
                 metadata = json.load(f)
             cached_time = datetime.fromisoformat(metadata.get("fetched_at", "1970-01-01"))
             expiry_time = cached_time + timedelta(hours=self.cache_expiry_hours)
-            return datetime.now() < expiry_time
+            return self._now(cached_time) < expiry_time
         except Exception as e:
             print(f"⚠️  Error checking cache validity: {e}")
             return False
@@ -64,9 +115,9 @@ class BaseSocrataFetcher(ABC):
     def save_to_cache(self, df: pd.DataFrame) -> None:
         """Save DataFrame to cache with metadata."""
         try:
-            df.to_csv(self.cache_file, index=False)
+            df.to_parquet(self.cache_file, engine="pyarrow", compression=self.PARQUET_COMPRESSION, index=False)
             metadata = {
-                "fetched_at": datetime.now().isoformat(),
+                "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
                 "record_count": len(df),
                 "columns": list(df.columns),
                 "data_source": f"Socrata {self.base_domain}",
@@ -78,14 +129,67 @@ class BaseSocrataFetcher(ABC):
         except Exception as e:
             print(f"⚠️  Could not cache data: {e}")
 
-    def load_from_cache(self) -> pd.DataFrame:
-        """Load data from cache."""
+    def load_from_cache_if_fresh(self, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Load cached data only while it is still fresh, in one pass.
+
+        Folds ``is_cache_valid()`` + ``load_from_cache()`` together so the
+        metadata file is stat'd and parsed once instead of twice per call.
+        Returns ``None`` when the cache is missing, expired, or unreadable.
+        """
+        if not (self.cache_file.exists() or self.legacy_cache_file.exists()):
+            return None
         try:
-            df = pd.read_csv(self.cache_file)
             with open(self.metadata_file, "r") as f:
                 metadata = json.load(f)
             cached_time = datetime.fromisoformat(metadata.get("fetched_at", "1970-01-01"))
-            age_hours = (datetime.now() - cached_time).total_seconds() / 3600
+            expiry_time = cached_time + timedelta(hours=self.cache_expiry_hours)
+            if self._now(cached_time) >= expiry_time:
+                return None
+            return self.load_from_cache(columns=columns, _metadata=metadata)
+        except Exception:
+            return None
+
+    def load_from_cache(
+        self,
+        columns: Optional[List[str]] = None,
+        _metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Load data from cache (migrating any legacy CSV cache once).
+
+        A missing or zero-byte cache file returns ``None`` immediately —
+        one ``stat`` call instead of spinning up a Parquet/CSV reader just
+        to fail.
+
+        ``columns`` restricts the read to the given columns — Parquet skips
+        the other column chunks entirely, so pruned loads touch far fewer
+        bytes.  Columns missing from the cache are silently ignored.
+        ``_metadata`` lets ``load_from_cache_if_fresh`` hand over the already
+        parsed metadata so the file isn't read twice.
+        """
+        target = self.cache_file if self.cache_file.exists() else self.legacy_cache_file
+        if not target.exists() or target.stat().st_size == 0:
+            return None
+        try:
+            if not self.cache_file.exists() and self.legacy_cache_file.exists():
+                print(f"🔄 Migrating legacy CSV cache to Parquet: {self.legacy_cache_file}")
+                legacy_df = pd.read_csv(self.legacy_cache_file)
+                legacy_df.to_parquet(self.cache_file, engine="pyarrow", compression="snappy", index=False)
+                os.remove(self.legacy_cache_file)
+            read_cols = None
+            if columns:
+                import pyarrow.parquet as pq
+                available = set(pq.read_schema(self.cache_file).names)
+                read_cols = [c for c in columns if c in available] or None
+            read_kwargs: Dict[str, Any] = {}
+            if self.PARQUET_DTYPE_BACKEND:
+                read_kwargs["dtype_backend"] = self.PARQUET_DTYPE_BACKEND
+            df = pd.read_parquet(self.cache_file, engine="pyarrow", columns=read_cols, **read_kwargs)
+            metadata = _metadata
+            if metadata is None:
+                with open(self.metadata_file, "r") as f:
+                    metadata = json.load(f)
+            cached_time = datetime.fromisoformat(metadata.get("fetched_at", "1970-01-01"))
+            age_hours = (self._now(cached_time) - cached_time).total_seconds() / 3600
             print(f"📋 Loaded {len(df):,} records from cache (age: {age_hours:.1f} hours)")
             return df
         except Exception as e:
@@ -100,7 +204,7 @@ class BaseSocrataFetcher(ABC):
             with open(self.metadata_file, "r") as f:
                 metadata = json.load(f)
             cached_time = datetime.fromisoformat(metadata.get("fetched_at", "1970-01-01"))
-            age_hours = (datetime.now() - cached_time).total_seconds() / 3600
+            age_hours = (self._now(cached_time) - cached_time).total_seconds() / 3600
             return {
                 "cached": True,
                 "fetched_at": metadata.get("fetched_at"),
@@ -119,6 +223,9 @@ class BaseSocrataFetcher(ABC):
             if self.cache_file.exists():
                 os.remove(self.cache_file)
                 print(f"🗑️  Removed cache file: {self.cache_file}")
+            if self.legacy_cache_file.exists():
+                os.remove(self.legacy_cache_file)
+                print(f"🗑️  Removed legacy cache file: {self.legacy_cache_file}")
             if self.metadata_file.exists():
                 os.remove(self.metadata_file)
                 print(f"🗑️  Removed metadata file: {self.metadata_file}")
@@ -134,88 +241,182 @@ class BaseSocrataFetcher(ABC):
         return f"https://{self.base_domain}/resource/{self.dataset_id}.json"
 
     def get_total_record_count(self) -> int:
-        """Get the total number of records available via API."""
+        """Get the total number of records available via API.
+
+        Sends an ETag conditional GET when a previous count is on disk —
+        Socrata answers 304 with an empty body if nothing changed, so the
+        stored count is reused without transferring or parsing a payload.
+        """
+        state: Dict[str, Any] = {}
+        try:
+            if self.count_state_file.exists():
+                with open(self.count_state_file, "r") as f:
+                    state = json.load(f)
+        except Exception:
+            state = {}
+
+        headers = {"If-None-Match": state["etag"]} if state.get("etag") else None
         try:
             url = f"{self.get_resource_url()}?$select=count(*)"
-            response = requests.get(url, timeout=30)
+            response = self._session.get(url, timeout=30, headers=headers)
+            if response.status_code == 304 and state.get("count"):
+                return int(state["count"])
             response.raise_for_status()
             data = response.json()
             if data and len(data) > 0:
-                return int(data[0].get("count", 0))
+                count = int(data[0].get("count", 0))
+                etag = response.headers.get("ETag")
+                if etag:
+                    try:
+                        with open(self.count_state_file, "w") as f:
+                            json.dump({"etag": etag, "count": count}, f)
+                    except Exception:
+                        pass
+                return count
         except Exception as e:
             print(f"⚠️  Could not get record count: {e}")
         return 0
 
-    def fetch_json_batch(self, offset: int, limit: int, extra_params: Optional[Dict[str, str]] = None) -> pd.DataFrame:
-        """Fetch a batch of records from the Socrata JSON resource API."""
+    def fetch_json_batch(self, offset: int, limit: int, extra_params: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Fetch a batch of records from the Socrata JSON resource API.
+
+        Returns the raw list of record dicts — DataFrame construction is
+        deferred to the caller so the full dataset is built (and dtype-
+        inferred) exactly once instead of per batch.
+        """
         params: Dict[str, Any] = {"$offset": offset, "$limit": min(limit, self.max_limit)}
         if extra_params:
             params.update(extra_params)
         try:
             print(f"  📥 Fetching records {offset:,} to {offset + limit:,}...")
-            response = requests.get(self.get_resource_url(), params=params, timeout=60)
+            response = self._session.get(self.get_resource_url(), params=params, timeout=60)
             response.raise_for_status()
             data = response.json()
             if data:
-                df = pd.DataFrame(data)
-                print(f"  ✅ Retrieved {len(df):,} records")
-                return df
+                print(f"  ✅ Retrieved {len(data):,} records")
+                return data
             print(f"  ⚠️  Empty response for offset {offset}")
-            return pd.DataFrame()
+            return []
         except requests.exceptions.RequestException as e:
             print(f"  ❌ Error fetching batch at offset {offset}: {e}")
             raise
 
-    def fetch_all_data(self, force_refresh: bool = False) -> pd.DataFrame:
-        """Fetch all data with pagination and caching."""
-        if not force_refresh and self.is_cache_valid():
-            print("📋 Using cached data (still fresh)")
-            return self.load_from_cache()
+    def _fetch_batches_concurrent(self, total_records: int) -> List[Dict[str, Any]]:
+        """Fetch all batches for a known record count with bounded concurrency.
+
+        The offsets are computed up front from ``total_records``, then fetched
+        in parallel by a small thread pool — the wall clock is dominated by
+        HTTP round trips, so overlapping them is a near-linear speedup.
+        Returns the records flattened back into offset order.
+        """
+        capped_total = min(total_records, self.batch_size * 100)
+        offsets = list(range(0, capped_total, self.batch_size))
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        workers = min(self.max_concurrent_fetches, len(offsets))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.fetch_json_batch, offset, self.batch_size): offset
+                for offset in offsets
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        records: List[Dict[str, Any]] = []
+        for offset in sorted(results):
+            records.extend(results[offset])
+        return records
+
+    @staticmethod
+    def _records_to_dataframe(records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Convert fetched records to a DataFrame through Arrow.
+
+        ``pa.Table.from_pylist`` builds columns in C and ``to_pandas`` with
+        ``split_blocks``/``self_destruct`` hands them over without an extra
+        copy — skipping pandas' per-cell dtype inference.  Falls back to
+        ``DataFrame.from_records`` when the records are too ragged for
+        Arrow's type inference.
+        """
+        try:
+            import pyarrow as pa
+            table = pa.Table.from_pylist(records)
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        except Exception as e:
+            print(f"  ⚠️  Arrow conversion failed ({e}); using pandas fallback")
+            return pd.DataFrame.from_records(records)
+
+    def fetch_all_data(self, force_refresh: bool = False, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Fetch all data with pagination and caching.
+
+        ``columns`` optionally prunes the returned frame to the named columns
+        (the full dataset is always cached so other consumers aren't affected).
+        """
+        if not force_refresh:
+            cached = self.load_from_cache_if_fresh(columns=columns)
+            if cached is not None:
+                print("📋 Using cached data (still fresh)")
+                return cached
 
         print(f"🌐 Fetching fresh data from {self.base_domain} (dataset {self.dataset_id})...")
         total_records = self.get_total_record_count()
         if total_records:
             print(f"📊 Estimated total records: {total_records:,}")
 
-        all_dataframes = []
-        offset = 0
-        batch_count = 0
+        all_records: List[Dict[str, Any]] = []
 
-        while True:
+        # Fast path: known record count lets us fetch batches concurrently
+        if total_records:
             try:
-                batch_df = self.fetch_json_batch(offset, self.batch_size)
-                if batch_df.empty:
-                    print("  🏁 No more records available")
-                    break
-                all_dataframes.append(batch_df)
-                batch_count += 1
-                offset += len(batch_df)
-                if len(batch_df) < self.batch_size:
-                    print("  🏁 Reached end of dataset")
-                    break
-                time.sleep(0.5)
-                if batch_count > 100:
-                    print("  ⚠️  Reached batch limit, stopping")
-                    break
+                all_records = self._fetch_batches_concurrent(total_records)
             except Exception as e:
-                print(f"❌ Error during batch fetch: {e}")
-                if all_dataframes:
-                    print("🔄 Using partial data fetched so far...")
-                    break
-                raise
+                print(f"❌ Error during concurrent fetch: {e}")
+                print("🔄 Falling back to sequential pagination...")
+                all_records = []
+
+        # Sequential fallback: unknown count (or concurrent fetch failed)
+        if not all_records:
+            offset = 0
+            batch_count = 0
+            while True:
+                try:
+                    batch = self.fetch_json_batch(offset, self.batch_size)
+                    if not batch:
+                        print("  🏁 No more records available")
+                        break
+                    all_records.extend(batch)
+                    batch_count += 1
+                    offset += len(batch)
+                    if len(batch) < self.batch_size:
+                        print("  🏁 Reached end of dataset")
+                        break
+                    time.sleep(0.5)
+                    if batch_count > 100:
+                        print("  ⚠️  Reached batch limit, stopping")
+                        break
+                except Exception as e:
+                    print(f"❌ Error during batch fetch: {e}")
+                    if all_records:
+                        print("🔄 Using partial data fetched so far...")
+                        break
+                    raise
 
-        if not all_dataframes:
+        if not all_records:
             raise ValueError(f"No data could be fetched from {self.base_domain}/{self.dataset_id}")
 
-        print(f"🔗 Combining {len(all_dataframes)} batches...")
-        combined_df = pd.concat(all_dataframes, ignore_index=True)
+        print(f"🔗 Building DataFrame from {len(all_records):,} records...")
+        combined_df = self._records_to_dataframe(all_records)
 
         initial_count = len(combined_df)
-        combined_df = combined_df.drop_duplicates()
+        if self.PRIMARY_KEY and all(c in combined_df.columns for c in self.PRIMARY_KEY):
+            combined_df = combined_df.drop_duplicates(subset=list(self.PRIMARY_KEY), keep="last")
+        else:
+            combined_df = combined_df.drop_duplicates()
         final_count = len(combined_df)
         if initial_count != final_count:
             print(f"🧹 Removed {initial_count - final_count:,} duplicate records")
 
         print(f"✅ Successfully fetched {final_count:,} total records")
         self.save_to_cache(combined_df)
+        if columns:
+            present = [c for c in columns if c in combined_df.columns]
+            if present:
+                return combined_df[present]
         return combined_df
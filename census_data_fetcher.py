@@ -15,6 +15,8 @@ class CensusDataFetcher(BaseSocrataFetcher):
     """Fetch ACS 5-Year census/demographics data by community area."""
 
     DATASET_ID = "t68z-cikk"
+    # One row per community area per ACS year
+    PRIMARY_KEY = ("community_area", "acs_year")
 
     def __init__(
         self,
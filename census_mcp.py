@@ -6,6 +6,8 @@ Provides MCP tools for querying population, income distribution, race/ethnicity,
 and age/gender demographics across Chicago's 77 community areas.
 """
 
+import copy
+import functools
 import json
 import pandas as pd
 from pathlib import Path
@@ -66,22 +68,36 @@ AGE_GENDER_COLS = [
     "female_35_to_49", "female_50_to_64", "female_65",
 ]
 
+AGE_GENDER_LABELS = {col: col.replace("_", " ").title() for col in AGE_GENDER_COLS}
 
+
+@functools.lru_cache(maxsize=1)
 def _load_community_area_lookup() -> Dict:
-    """Load the shared community area lookup JSON."""
+    """Load the shared community area lookup JSON (parsed once per process)."""
     path = Path("knowledge_base/community_areas.json")
     if not path.exists():
         return {"areas": {}, "aliases": {}}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return json.loads(path.read_bytes())
 
 
 class CensusDataMCP(BaseDataDomain):
     """MCP domain for ACS 5-Year census/demographics data."""
 
+    # Only these columns are ever queried — pruning the read keeps the
+    # Parquet load (and the in-memory frame) minimal.
+    REQUIRED_COLS = (
+        INCOME_COLS + RACE_COLS + AGE_GENDER_COLS
+        + ["total_population", "community_area", "acs_year"]
+    )
+
     def __init__(self, cache_dir: str = "./data/cache"):
         self.fetcher = CensusDataFetcher(cache_dir=cache_dir)
         self.df: Optional[pd.DataFrame] = None
+        # Year partitions, rebuilt by _prepare_dataframe()
+        self._by_year: Dict[int, pd.DataFrame] = {}
+        self._available_years: List[int] = []
+        self._latest_year: Optional[int] = None
+        self._valid_area_set: set = set()
         self._ca_lookup = _load_community_area_lookup()
         # Build a lowercase name → number map for fuzzy matching
         self._name_to_num: Dict[str, int] = {}
@@ -89,8 +105,23 @@ class CensusDataMCP(BaseDataDomain):
             self._name_to_num[name.lower()] = int(num_str)
         for alias, num in self._ca_lookup.get("aliases", {}).items():
             self._name_to_num[alias.lower()] = int(num)
-        # Attempt to load data on construction
-        self.load_data()
+        # Canonical title-cased name per CA number, computed once
+        self._canonical_by_num: Dict[int, str] = {
+            int(num_str): name.title()
+            for num_str, name in self._ca_lookup.get("areas", {}).items()
+        }
+        # Trigram posting lists over every known name/alias — fuzzy matching
+        # becomes hash lookups + a score instead of a linear substring scan.
+        self._trigram_index: Dict[str, set] = {}
+        self._gram_count: Dict[int, int] = {}
+        for known_lower, num in self._name_to_num.items():
+            grams = self._trigrams(known_lower)
+            self._gram_count[num] = max(self._gram_count.get(num, 0), len(grams))
+            for tri in grams:
+                self._trigram_index.setdefault(tri, set()).add(num)
+        # Data loads lazily on the first tool call — startup shouldn't pay
+        # the fetch for domains the user may never query
+        self._load_attempted = False
 
     # ------------------------------------------------------------------
     # BaseDataDomain interface
@@ -100,9 +131,16 @@ class CensusDataMCP(BaseDataDomain):
     def domain_name(self) -> str:
         return "census_demographics"
 
+    def _ensure_loaded(self) -> None:
+        """Trigger the data load on first use (at most one attempt)."""
+        if self.df is None and not self._load_attempted:
+            self.load_data()
+
     def load_data(self, **kwargs) -> bool:
         try:
-            self.df = self.fetcher.fetch_all_data()
+            self._load_attempted = True
+            self._query_demographics_cached.cache_clear()
+            self.df = self.fetcher.fetch_all_data(columns=self.REQUIRED_COLS)
             if self.df is not None and not self.df.empty:
                 self._prepare_dataframe()
                 print(f"  ✅ Census data loaded: {len(self.df)} rows")
@@ -155,6 +193,7 @@ class CensusDataMCP(BaseDataDomain):
         ]
 
     def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        self._ensure_loaded()
         if tool_name == "query_census_demographics":
             return self.query_demographics(
                 community_area=arguments.get("community_area"),
@@ -184,24 +223,51 @@ class CensusDataMCP(BaseDataDomain):
         numeric_cols = (
             INCOME_COLS + RACE_COLS + AGE_GENDER_COLS + ["total_population"]
         )
-        for col in numeric_cols:
-            if col in self.df.columns:
-                self.df[col] = pd.to_numeric(self.df[col], errors="coerce")
+        # Single batched coercion: one assignment instead of one new column
+        # block per iteration (downcast shrinks counts to int32 where they fit)
+        present = [c for c in numeric_cols if c in self.df.columns]
+        if present:
+            self.df[present] = self.df[present].apply(
+                pd.to_numeric, errors="coerce", downcast="integer"
+            )
 
-        # Standardise community area name to title case for matching
+        # Standardise community area name to title case for matching.
+        # Categorical dtype: 77 distinct names, so isin/groupby work on
+        # small integer codes instead of Python strings.
         if "community_area" in self.df.columns:
             self.df["community_area_clean"] = (
-                self.df["community_area"].str.strip().str.title()
+                self.df["community_area"].str.strip().str.title().astype("category")
             )
+        self._valid_area_set = (
+            set(self.df["community_area_clean"].dropna().unique())
+            if "community_area_clean" in self.df.columns
+            else set()
+        )
+
+        # Parse ACS year (nullable Int32 — years fit comfortably)
+        if "acs_year" in self.df.columns:
+            self.df["acs_year"] = pd.to_numeric(self.df["acs_year"], errors="coerce").astype("Int32")
 
-        # Parse ACS year
+        # Partition by year once so per-query filtering is a dict lookup
+        # instead of a boolean mask over the whole frame.
+        self._by_year = {}
         if "acs_year" in self.df.columns:
-            self.df["acs_year"] = pd.to_numeric(self.df["acs_year"], errors="coerce")
+            for yr, group in self.df.groupby("acs_year"):
+                self._by_year[int(yr)] = group
+        self._available_years = sorted(self._by_year)
+        self._latest_year = self._available_years[-1] if self._available_years else None
 
     # ------------------------------------------------------------------
     # Community area resolution
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _trigrams(text: str) -> set:
+        """Character trigrams of text (the text itself when shorter than 3)."""
+        if len(text) < 3:
+            return {text}
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
     def _resolve_community_area(self, value: str) -> Optional[str]:
         """Resolve a community area name or number to the canonical name in the df."""
         if value is None:
@@ -210,10 +276,9 @@ class CensusDataMCP(BaseDataDomain):
 
         # Try as a number first
         try:
-            num = int(val)
-            name = self._ca_lookup.get("areas", {}).get(str(num))
+            name = self._canonical_by_num.get(int(val))
             if name:
-                return name.title()
+                return name
         except ValueError:
             pass
 
@@ -221,16 +286,24 @@ class CensusDataMCP(BaseDataDomain):
         lower = val.lower()
         num = self._name_to_num.get(lower)
         if num is not None:
-            name = self._ca_lookup.get("areas", {}).get(str(num))
+            name = self._canonical_by_num.get(num)
             if name:
-                return name.title()
-
-        # Fuzzy substring match against known names
-        for known_lower, known_num in self._name_to_num.items():
-            if lower in known_lower or known_lower in lower:
-                name = self._ca_lookup.get("areas", {}).get(str(known_num))
+                return name
+
+        # Fuzzy match via the trigram index: score candidates by how many of
+        # the input's trigrams they share, normalised by the shorter side.
+        grams = self._trigrams(lower)
+        scores: Dict[int, int] = {}
+        for tri in grams:
+            for cand in self._trigram_index.get(tri, ()):
+                scores[cand] = scores.get(cand, 0) + 1
+        if scores:
+            best_num, best_hits = max(scores.items(), key=lambda kv: kv[1])
+            denom = min(len(grams), self._gram_count.get(best_num, len(grams))) or 1
+            if best_hits / denom >= 0.6:
+                name = self._canonical_by_num.get(best_num)
                 if name:
-                    return name.title()
+                    return name
 
         return val.title()  # best-effort fallback
 
@@ -246,18 +319,36 @@ class CensusDataMCP(BaseDataDomain):
         compare_areas: Optional[List[str]] = None,
         top_n: int = 10,
     ) -> Dict[str, Any]:
-        """Query census demographics data."""
+        """Query census demographics data.
+
+        Results are memoized per argument set (conversations tend to re-ask
+        the same year/area); the cache is cleared whenever data is reloaded.
+        """
+        compare_key = tuple(compare_areas) if compare_areas else None
+        result = self._query_demographics_cached(community_area, year, metric, compare_key, top_n)
+        # Deep copy so callers can't mutate the cached entry
+        return copy.deepcopy(result)
+
+    @functools.lru_cache(maxsize=256)
+    def _query_demographics_cached(
+        self,
+        community_area: Optional[str],
+        year: Optional[int],
+        metric: str,
+        compare_areas: Optional[tuple],
+        top_n: int,
+    ) -> Dict[str, Any]:
         if self.df is None or self.df.empty:
             return {"error": "Census data not loaded"}
 
-        df = self.df.copy()
+        # Queries are read-only, so no defensive copy is needed — the year
+        # filter resolves to a precomputed partition.
+        df = self.df
 
         # Filter by year (default: latest)
-        if "acs_year" in df.columns:
-            available_years = sorted(df["acs_year"].dropna().unique())
-            target_year = year if year and year in available_years else (available_years[-1] if available_years else None)
-            if target_year is not None:
-                df = df[df["acs_year"] == target_year]
+        if self._available_years:
+            target_year = year if year and year in self._available_years else self._latest_year
+            df = self._by_year.get(target_year, df)
         else:
             target_year = None
 
@@ -281,12 +372,21 @@ class CensusDataMCP(BaseDataDomain):
 
         # If specific areas requested, filter df
         if areas_to_query:
+            result["areas_queried"] = areas_to_query
+            # Reject unknown names via set lookup before touching the frame
+            if self._valid_area_set:
+                known_areas = [a for a in areas_to_query if a in self._valid_area_set]
+            else:
+                known_areas = areas_to_query
+            if not known_areas:
+                result["areas_found"] = 0
+                result["area_data"] = []
+                return result
             if "community_area_clean" in df.columns:
-                mask = df["community_area_clean"].isin(areas_to_query)
+                mask = df["community_area_clean"].isin(known_areas)
                 area_df = df[mask]
             else:
                 area_df = df
-            result["areas_queried"] = areas_to_query
             result["areas_found"] = len(area_df)
             result["area_data"] = self._extract_area_data(area_df, metric)
         else:
@@ -299,35 +399,65 @@ class CensusDataMCP(BaseDataDomain):
     # Data extraction helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _as_int64(obj):
+        """Nullable-Int64 view of a Series or frame, tolerating fractional
+        or stray string values the way the old per-cell _safe_int did
+        (rounded / coerced to <NA> instead of raising)."""
+        try:
+            return obj.round().astype("Int64")
+        except (TypeError, ValueError):
+            if isinstance(obj, pd.DataFrame):
+                coerced = obj.apply(pd.to_numeric, errors="coerce")
+            else:
+                coerced = pd.to_numeric(obj, errors="coerce")
+            return coerced.round().astype("Int64")
+
     def _extract_area_data(self, df: pd.DataFrame, metric: str) -> List[Dict[str, Any]]:
-        """Extract metric data for each row in df."""
+        """Extract metric data for each row in df.
+
+        Works on column-group slices with vectorized Int64 conversion and
+        ``to_dict(orient="records")`` instead of per-cell ``iterrows`` access.
+        """
+        if "community_area_clean" in df.columns:
+            names = df["community_area_clean"].astype(str).tolist()
+        elif "community_area" in df.columns:
+            names = df["community_area"].astype(str).tolist()
+        else:
+            names = ["?"] * len(df)
+
+        def _records(cols: List[str], labels: Dict[str, str]) -> List[Dict[str, Optional[int]]]:
+            present = [c for c in cols if c in df.columns]
+            if not present:
+                return [{} for _ in range(len(df))]
+            recs = self._as_int64(df[present]).to_dict(orient="records")
+            return [
+                {labels.get(c, c): (int(v) if pd.notna(v) else None) for c, v in r.items()}
+                for r in recs
+            ]
+
+        populations: Optional[List[Optional[int]]] = None
+        if metric in ("all", "population") and "total_population" in df.columns:
+            populations = [
+                int(v) if pd.notna(v) else None
+                for v in self._as_int64(df["total_population"]).tolist()
+            ]
+
+        income = _records(INCOME_COLS, INCOME_LABELS) if metric in ("all", "income") else None
+        race = _records(RACE_COLS, RACE_LABELS) if metric in ("all", "race") else None
+        age = _records(AGE_GENDER_COLS, AGE_GENDER_LABELS) if metric in ("all", "age") else None
+
         rows = []
-        for _, row in df.iterrows():
-            entry: Dict[str, Any] = {
-                "community_area": row.get("community_area_clean", row.get("community_area", "?")),
-            }
+        for i, name in enumerate(names):
+            entry: Dict[str, Any] = {"community_area": name}
             if metric in ("all", "population"):
-                entry["total_population"] = self._safe_int(row.get("total_population"))
-
-            if metric in ("all", "income"):
-                entry["income_distribution"] = {}
-                for col in INCOME_COLS:
-                    if col in row.index:
-                        entry["income_distribution"][INCOME_LABELS.get(col, col)] = self._safe_int(row[col])
-
-            if metric in ("all", "race"):
-                entry["race_ethnicity"] = {}
-                for col in RACE_COLS:
-                    if col in row.index:
-                        entry["race_ethnicity"][RACE_LABELS.get(col, col)] = self._safe_int(row[col])
-
-            if metric in ("all", "age"):
-                entry["age_gender"] = {}
-                for col in AGE_GENDER_COLS:
-                    if col in row.index:
-                        label = col.replace("_", " ").title()
-                        entry["age_gender"][label] = self._safe_int(row[col])
-
+                entry["total_population"] = populations[i] if populations else None
+            if income is not None:
+                entry["income_distribution"] = income[i]
+            if race is not None:
+                entry["race_ethnicity"] = race[i]
+            if age is not None:
+                entry["age_gender"] = age[i]
             rows.append(entry)
         return rows
 
@@ -353,62 +483,62 @@ class CensusDataMCP(BaseDataDomain):
         if sort_col is None or sort_col not in df.columns:
             return {"note": "No suitable ranking column found"}
 
-        ranked = df.nlargest(top_n, sort_col)
-        items = []
+        ranked = self._top_n(df, sort_col, top_n)
         name_col = "community_area_clean" if "community_area_clean" in df.columns else "community_area"
-        for _, row in ranked.iterrows():
-            items.append({
-                "community_area": str(row.get(name_col, "?")),
-                "value": self._safe_int(row.get(sort_col)),
-            })
+        names = ranked[name_col].astype(str).tolist()
+        values = self._as_int64(ranked[sort_col]).tolist()
+        items = [
+            {"community_area": name, "value": int(val) if pd.notna(val) else None}
+            for name, val in zip(names, values)
+        ]
         return {"ranked_by": label, "top_n": top_n, "items": items}
 
-    @staticmethod
-    def _safe_int(val) -> Optional[int]:
-        try:
-            return int(float(val))
-        except (ValueError, TypeError):
-            return None
-
     # ------------------------------------------------------------------
     # Formatting
     # ------------------------------------------------------------------
 
-    def _format_demographics_result(self, result: Dict[str, Any]) -> str:
-        lines: List[str] = []
-        lines.append("📊 **Census Demographics (ACS 5-Year)**")
-        lines.append(f"Survey Year: {result.get('acs_year', '?')}")
-        lines.append(f"Metric: {result.get('metric', 'all')}")
+    @staticmethod
+    def _fmt_count(val: Optional[int]) -> str:
+        return f"{val:,}" if val else "N/A"
+
+    def _fmt_area(self, area: Dict[str, Any]) -> List[str]:
+        """Format one area's data block as a list of lines."""
+        lines = [f"### {area.get('community_area', '?')}"]
+        pop = area.get("total_population")
+        if pop is not None:
+            lines.append(f"  Population: {pop:,}")
+        for key, heading in (
+            ("income_distribution", "  **Income Distribution (households):**"),
+            ("race_ethnicity", "  **Race/Ethnicity:**"),
+            ("age_gender", "  **Age/Gender:**"),
+        ):
+            group = area.get(key)
+            if group is not None:
+                lines.append(heading)
+                lines.extend(f"    {label}: {self._fmt_count(val)}" for label, val in group.items())
         lines.append("")
+        return lines
 
-        # Area-specific data
-        if "area_data" in result:
-            for area in result["area_data"]:
-                lines.append(f"### {area.get('community_area', '?')}")
-                if "total_population" in area and area["total_population"] is not None:
-                    lines.append(f"  Population: {area['total_population']:,}")
-                if "income_distribution" in area:
-                    lines.append("  **Income Distribution (households):**")
-                    for label, val in area["income_distribution"].items():
-                        lines.append(f"    {label}: {val:,}" if val else f"    {label}: N/A")
-                if "race_ethnicity" in area:
-                    lines.append("  **Race/Ethnicity:**")
-                    for label, val in area["race_ethnicity"].items():
-                        lines.append(f"    {label}: {val:,}" if val else f"    {label}: N/A")
-                if "age_gender" in area:
-                    lines.append("  **Age/Gender:**")
-                    for label, val in area["age_gender"].items():
-                        lines.append(f"    {label}: {val:,}" if val else f"    {label}: N/A")
-                lines.append("")
-
-        # Ranking
-        if "ranking" in result:
-            ranking = result["ranking"]
-            lines.append(f"**Ranking by {ranking.get('ranked_by', '?')} (Top {ranking.get('top_n', '?')}):**")
-            for i, item in enumerate(ranking.get("items", []), 1):
-                val = item.get("value")
-                val_str = f"{val:,}" if val is not None else "N/A"
-                lines.append(f"  {i}. {item['community_area']}: {val_str}")
-            lines.append("")
+    @staticmethod
+    def _fmt_ranking(ranking: Dict[str, Any]) -> List[str]:
+        """Format the ranking block as a list of lines."""
+        lines = [f"**Ranking by {ranking.get('ranked_by', '?')} (Top {ranking.get('top_n', '?')}):**"]
+        for i, item in enumerate(ranking.get("items", []), 1):
+            val = item.get("value")
+            val_str = f"{val:,}" if val is not None else "N/A"
+            lines.append(f"  {i}. {item['community_area']}: {val_str}")
+        lines.append("")
+        return lines
 
+    def _format_demographics_result(self, result: Dict[str, Any]) -> str:
+        lines: List[str] = [
+            "📊 **Census Demographics (ACS 5-Year)**",
+            f"Survey Year: {result.get('acs_year', '?')}",
+            f"Metric: {result.get('metric', 'all')}",
+            "",
+        ]
+        for area in result.get("area_data", []):
+            lines.extend(self._fmt_area(area))
+        if "ranking" in result:
+            lines.extend(self._fmt_ranking(result["ranking"]))
         return "\n".join(lines)
@@ -6,14 +6,22 @@ Fetches homicide data from Chicago's open data API with pagination support.
 Handles large datasets by automatically managing API limits and offsets.
 """
 
+import json
+import logging
+
 import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from pathlib import Path
-from io import StringIO
 
 from base_fetcher import BaseSocrataFetcher
 
+# Per-batch progress goes through logging (INFO, off by default) so parallel
+# fetch workers don't serialize on synchronous stdout writes.
+logger = logging.getLogger(__name__)
+
 
 class ChicagoHomicideDataFetcher(BaseSocrataFetcher):
     """Fetches and caches Chicago homicide data from the city's open data API.
@@ -26,6 +34,15 @@ class ChicagoHomicideDataFetcher(BaseSocrataFetcher):
     CRIMES_DATASET_ID = "ijzp-q8t2"
     # Special CSV export view for homicides
     CSV_VIEW_ID = "iyvd-p5ga"
+    # Every crime record carries a unique portal ID
+    PRIMARY_KEY = ("ID",)
+
+    # Compact dtypes for the combined/cached frame — low-cardinality strings
+    # become categoricals, small numerics drop to 32-bit.  Only applied to
+    # columns actually present in the fetched view.
+    CATEGORY_COLS = ("Primary Type", "Description", "Location Description", "Block", "IUCR", "FBI Code")
+    INT32_COLS = ("Beat", "District", "Ward", "Community Area", "Year")
+    FLOAT32_COLS = ("Latitude", "Longitude")
 
     def __init__(self, cache_dir: str = "./data/cache"):
         super().__init__(
@@ -33,7 +50,7 @@ class ChicagoHomicideDataFetcher(BaseSocrataFetcher):
             base_domain="data.cityofchicago.org",
             cache_dir=cache_dir,
             cache_expiry_hours=6,
-            cache_filename="homicides_cache.csv",
+            cache_filename="homicides_cache.parquet",
         )
         # CSV export endpoint (faster for bulk fetches)
         self.csv_url = f"https://data.cityofchicago.org/api/v3/views/{self.CSV_VIEW_ID}/query.csv"
@@ -45,43 +62,100 @@ class ChicagoHomicideDataFetcher(BaseSocrataFetcher):
     # ------------------------------------------------------------------
 
     def get_total_record_count(self) -> int:
-        """Get the total number of records available via API."""
+        """Get the total number of records available via API.
+
+        The count(*) query forces a server-side scan of the full crimes
+        dataset, so the result is cached on disk and reused until it is
+        older than cache_expiry_hours.
+        """
+        state: Dict[str, Any] = {}
+        try:
+            if self.count_state_file.exists():
+                with open(self.count_state_file, "r") as f:
+                    state = json.load(f)
+        except Exception:
+            state = {}
+
+        if state.get("count") and state.get("fetched_at"):
+            try:
+                fetched_at = datetime.fromisoformat(state["fetched_at"])
+                age_hours = (self._now(fetched_at) - fetched_at).total_seconds() / 3600
+                if age_hours < self.cache_expiry_hours:
+                    return int(state["count"])
+            except Exception:
+                pass
+
         try:
             count_url = f"https://data.cityofchicago.org/resource/{self.CRIMES_DATASET_ID}.json?$select=count(*)"
-            response = requests.get(count_url, timeout=30)
+            response = self._session.get(count_url, timeout=30)
             response.raise_for_status()
             data = response.json()
             if data and len(data) > 0:
-                return int(data[0].get("count", 0))
+                count = int(data[0].get("count", 0))
+                try:
+                    with open(self.count_state_file, "w") as f:
+                        json.dump({
+                            "count": count,
+                            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                        }, f)
+                except Exception:
+                    pass
+                return count
         except Exception as e:
             print(f"⚠️  Could not get record count: {e}")
         return 15000  # Conservative fallback
 
+    @staticmethod
+    def _parse_csv_stream(raw) -> pd.DataFrame:
+        """Parse a CSV byte stream into a DataFrame.
+
+        Uses pyarrow's multithreaded CSV reader when available and falls
+        back to the single-threaded pandas C parser otherwise.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+        except ImportError:
+            return pd.read_csv(raw, engine="c", low_memory=False)
+        try:
+            table = pacsv.read_csv(
+                raw,
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+            )
+        except pa.ArrowInvalid:
+            # Empty response body — same outcome as pandas' EmptyDataError
+            return pd.DataFrame()
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
     def fetch_batch(self, offset: int, limit: int) -> pd.DataFrame:
         """Fetch a batch of records from the CSV API."""
         params = {"$offset": offset, "$limit": min(limit, self.max_limit)}
         try:
-            print(f"  📥 Fetching records {offset:,} to {offset + limit:,}...")
-            response = requests.get(self.csv_url, params=params, timeout=60)
+            logger.info("  📥 Fetching records %s to %s...", f"{offset:,}", f"{offset + limit:,}")
+            response = self._session.get(
+                self.csv_url, params=params, stream=True, timeout=60
+            )
             response.raise_for_status()
-            if response.text.strip():
-                df = pd.read_csv(StringIO(response.text))
-                print(f"  ✅ Retrieved {len(df):,} records")
-                return df
-            print(f"  ⚠️  Empty response for offset {offset}")
-            return pd.DataFrame()
+            # Hand the (decompressed) byte stream straight to the parser
+            # instead of materializing the whole body as a str first.
+            response.raw.decode_content = True
+            df = self._parse_csv_stream(response.raw)
+            logger.info("  ✅ Retrieved %s records", f"{len(df):,}")
+            return df
         except requests.exceptions.RequestException as e:
-            print(f"  ❌ Error fetching batch at offset {offset}: {e}")
+            logger.warning("  ❌ Error fetching batch at offset %s: %s", offset, e)
             raise
         except pd.errors.EmptyDataError:
-            print(f"  ⚠️  No more data available at offset {offset}")
+            logger.info("  ⚠️  No more data available at offset %s", offset)
             return pd.DataFrame()
 
     def fetch_all_data(self, force_refresh: bool = False) -> pd.DataFrame:
         """Fetch all homicide data using the CSV endpoint with pagination."""
-        if not force_refresh and self.is_cache_valid():
-            print("📋 Using cached data (still fresh)")
-            return self.load_from_cache()
+        if not force_refresh:
+            cached = self.load_from_cache_if_fresh()
+            if cached is not None:
+                print("📋 Using cached data (still fresh)")
+                return cached
 
         print("🌐 Fetching fresh data from Chicago Open Data API...")
         total_records = self.get_total_record_count()
@@ -89,48 +163,101 @@ class ChicagoHomicideDataFetcher(BaseSocrataFetcher):
 
         all_dataframes = []
         offset = 0
-        batch_count = 0
-        import time
-
-        while True:
-            try:
-                batch_df = self.fetch_batch(offset, self.batch_size)
-                if batch_df.empty:
-                    print("  🏁 No more records available")
-                    break
-                all_dataframes.append(batch_df)
-                batch_count += 1
-                offset += len(batch_df)
-                if len(batch_df) < self.batch_size:
-                    print("  🏁 Reached end of dataset")
-                    break
-                time.sleep(0.5)
-                if batch_count > 100:
+        wave_count = 0
+        workers = self.max_concurrent_fetches
+        # The CSV view doesn't advertise its own row count (the estimate above
+        # comes from the parent crimes dataset), so offsets can't be planned up
+        # front.  Instead, dispatch batches in waves of `workers` concurrent
+        # requests and stop at the first empty or short batch.
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                while wave_count * workers <= 100:
+                    offsets = [offset + i * self.batch_size for i in range(workers)]
+                    futures = [
+                        executor.submit(self.fetch_batch, off, self.batch_size)
+                        for off in offsets
+                    ]
+                    done = False
+                    for future in futures:
+                        batch_df = future.result()
+                        n = len(batch_df)
+                        if n == 0:
+                            print("  🏁 No more records available")
+                            done = True
+                            break
+                        all_dataframes.append(batch_df)
+                        if n < self.batch_size:
+                            print("  🏁 Reached end of dataset")
+                            done = True
+                            break
+                    if done:
+                        break
+                    offset = offsets[-1] + self.batch_size
+                    wave_count += 1
+                else:
                     print("  ⚠️  Reached batch limit, stopping")
-                    break
-            except Exception as e:
-                print(f"❌ Error during batch fetch: {e}")
-                if all_dataframes:
-                    print("🔄 Using partial data fetched so far...")
-                    break
+        except Exception as e:
+            print(f"❌ Error during batch fetch: {e}")
+            if all_dataframes:
+                print("🔄 Using partial data fetched so far...")
+            else:
                 raise
 
         if not all_dataframes:
             raise ValueError("No data could be fetched from the API")
 
         print(f"🔗 Combining {len(all_dataframes)} batches...")
-        combined_df = pd.concat(all_dataframes, ignore_index=True)
+        if len(all_dataframes) == 1:
+            # Nothing to combine — skip the block copy a concat would force
+            combined_df = all_dataframes[0]
+        else:
+            # sort=False skips the column-union sort should batch column
+            # orderings ever drift
+            combined_df = pd.concat(all_dataframes, ignore_index=True, sort=False)
 
         initial_count = len(combined_df)
-        combined_df = combined_df.drop_duplicates()
+        key_cols = list(self.PRIMARY_KEY or ())
+        if key_cols and all(col in combined_df.columns for col in key_cols):
+            # Hashing just the key column(s) beats full-row dedup on ~22 cols
+            combined_df = combined_df.drop_duplicates(
+                subset=key_cols, keep="last", ignore_index=True
+            )
+        else:
+            combined_df = combined_df.drop_duplicates()
         final_count = len(combined_df)
         if initial_count != final_count:
             print(f"🧹 Removed {initial_count - final_count:,} duplicate records")
 
         print(f"✅ Successfully fetched {final_count:,} total records")
+        combined_df = self._downcast(combined_df)
         self.save_to_cache(combined_df)
         return combined_df
 
+    @classmethod
+    def _downcast(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Shrink column dtypes ahead of caching.
+
+        Parquet preserves the compact dtypes, so both the cache file and
+        every subsequent in-memory load benefit.  Columns that fail to
+        convert (unexpected values) are left as-is.
+        """
+        targets = {}
+        for col in cls.CATEGORY_COLS:
+            if col in df.columns:
+                targets[col] = "category"
+        for col in cls.INT32_COLS:
+            if col in df.columns:
+                targets[col] = "Int32"  # nullable — the portal leaves gaps
+        for col in cls.FLOAT32_COLS:
+            if col in df.columns:
+                targets[col] = "float32"
+        for col, dtype in targets.items():
+            try:
+                df[col] = df[col].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+        return df
+
 def main():
     """Test the data fetcher."""
     fetcher = ChicagoHomicideDataFetcher()
@@ -2,6 +2,13 @@ import yaml
 from typing import Dict, Any
 from pathlib import Path
 
+# Prefer the libyaml C loader when available (~5-10x faster parse);
+# fall back to the pure-Python loader otherwise.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 class Config:
     """Configuration manager for the Llama RAG system."""
     
@@ -15,7 +22,7 @@ class Config:
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
         
         with open(self.config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YamlLoader)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation (e.g., 'model.temperature')."""
@@ -1,9 +1,31 @@
 import json
+import logging
 import re
 import time
 from typing import Dict, Any, Optional, Union, List
 import mcp_integration
 
+# Per-iteration progress in the tool loop goes through logging (INFO, off by
+# default) rather than synchronous stdout prints.
+logger = logging.getLogger(__name__)
+
+# Marker scan: finds "TOOL_CALL:" and its opening brace in one linear pass.
+# Anything may sit between the marker and the brace (markdown fences, prose)
+# — only the first "{" after the marker counts.
+_MARKER_RE = re.compile(r'TOOL_CALL:[^{]*\{')
+# Fallback extraction for malformed tool-call JSON; compiled once at import.
+_TOOL_CALL_RE = re.compile(r'TOOL_CALL:[^{]*(\{.*?\})', re.DOTALL)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert parsed-JSON values into a hashable canonical form."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
 class IntelligentMCPHandler:
     """Handles intelligent MCP tool calling based on natural language questions."""
     
@@ -11,12 +33,32 @@ class IntelligentMCPHandler:
         # Tools are now fetched dynamically from the domain registry.
         # The list below is a cached copy refreshed on each call to get_tools().
         self._cached_tools: List[Dict[str, Any]] = []
-    
+        # Frozen set of tool names for O(1) membership checks in
+        # execute_tool_call; refreshed together with _cached_tools.
+        self._cached_tool_names: frozenset = frozenset()
+        # Resolved MCPIntegration instance, cached after first lookup
+        self._mcp_instance = None
+
+    def _get_mcp(self):
+        """Resolve the MCPIntegration instance once and reuse it.
+
+        Prefers the module-level singleton; only constructs a fresh
+        MCPIntegration (which loads every domain) if the singleton is absent.
+        """
+        if self._mcp_instance is None:
+            self._mcp_instance = getattr(mcp_integration, "mcp_integration", None)
+            if self._mcp_instance is None:
+                self._mcp_instance = mcp_integration.MCPIntegration()
+        return self._mcp_instance
+
     def get_tools(self) -> list:
         """Get available tools from all registered domains."""
-        mcp_inst = getattr(mcp_integration, "mcp_integration", None)
+        mcp_inst = self._get_mcp()
         if mcp_inst is not None:
             self._cached_tools = mcp_inst.get_all_tool_definitions()
+            self._cached_tool_names = frozenset(
+                tool["name"] for tool in self._cached_tools
+            )
         return self._cached_tools
 
     @property
@@ -30,61 +72,21 @@ class IntelligentMCPHandler:
         """Parse a tool call from the LLM response."""
         print(f"🔍 Looking for TOOL_CALL in response: {response_content[:100]}...")
         
-        if "TOOL_CALL:" not in response_content:
+        # Locate the marker and its opening brace in a single pass
+        marker = _MARKER_RE.search(response_content)
+        if marker is None:
             print("ℹ️  No TOOL_CALL found in response")
             return None
-            
+
         try:
-            # Find the TOOL_CALL: part
-            tool_call_start = response_content.find("TOOL_CALL:")
-            if tool_call_start == -1:
-                print("❌ TOOL_CALL: not found")
-                return None
-                
-            # Find the JSON part starting after "TOOL_CALL:"
-            json_start = response_content.find("{", tool_call_start)
-            if json_start == -1:
-                print("❌ No opening brace found after TOOL_CALL:")
-                return None
-                
-            # Find the matching closing brace using more robust approach
-            brace_count = 0
-            json_end = json_start
-            in_quotes = False
-            escape_next = False
-            
-            for i, char in enumerate(response_content[json_start:], json_start):
-                if escape_next:
-                    escape_next = False
-                    continue
-                    
-                if char == '\\':
-                    escape_next = True
-                    continue
-                    
-                if char == '"' and not escape_next:
-                    in_quotes = not in_quotes
-                    continue
-                
-                if not in_quotes:
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            json_end = i + 1
-                            break
-            
-            # Extract and parse the JSON
-            tool_call_json = response_content[json_start:json_end].strip()
-            print(f"🔍 Extracted JSON: {tool_call_json}")
-            
-            # Try to fix common JSON issues
-            if not tool_call_json.endswith('}'):
-                tool_call_json += '}'
-            
-            tool_call = json.loads(tool_call_json)
-            
+            json_start = marker.end() - 1
+
+            # Consume exactly one JSON object from the offset.  raw_decode
+            # does the brace/quote/escape tracking in C and ignores any
+            # trailing prose after the object.
+            tool_call, _ = json.JSONDecoder().raw_decode(response_content, json_start)
+            print(f"🔍 Extracted tool call JSON at offset {json_start}")
+
             if "name" not in tool_call:
                 print("❌ Tool call missing 'name' field")
                 return None
@@ -102,9 +104,7 @@ class IntelligentMCPHandler:
             # Try a simpler extraction as fallback
             try:
                 # Look for simple patterns like {"name": "tool_name"}
-                import re
-                pattern = r'TOOL_CALL:\s*(\{[^}]*\})'
-                match = re.search(pattern, response_content)
+                match = _TOOL_CALL_RE.search(response_content)
                 if match:
                     simple_json = match.group(1)
                     print(f"🔧 Trying fallback parsing: {simple_json}")
@@ -130,15 +130,15 @@ class IntelligentMCPHandler:
             "error": None
         }
 
-        if not tool_name or tool_name not in [tool["name"] for tool in self.tools]:
+        if not self._cached_tool_names:
+            self.get_tools()
+        if not tool_name or tool_name not in self._cached_tool_names:
             execution_summary["error"] = f"Unknown tool: {tool_name}"
             execution_summary["formatted_result"] = f"❌ Unknown tool: {tool_name}"
             return execution_summary
 
         try:
-            mcp_instance = getattr(mcp_integration, "mcp_integration", None)
-            if mcp_instance is None:
-                mcp_instance = mcp_integration.MCPIntegration()
+            mcp_instance = self._get_mcp()
             result = mcp_instance.call_tool(str(tool_name), arguments)
             execution_summary["raw_result"] = result
 
@@ -176,7 +176,7 @@ class IntelligentMCPHandler:
         - The total wall-clock timeout is exceeded
         - A duplicate tool call (same name+args) is detected
         """
-        print("🔍 Generating response with multi-tool calling capability...")
+        logger.info("🔍 Generating response with multi-tool calling capability...")
 
         interaction_trace: Dict[str, Any] = {
             "question": question,
@@ -186,7 +186,7 @@ class IntelligentMCPHandler:
 
         # Accumulate prior tool results across iterations
         prior_tool_results: List[Dict[str, str]] = []
-        # Track (tool_name, sorted_args_json) to detect duplicates
+        # Track (tool_name, frozen_args) to detect duplicates
         seen_calls: set = set()
         loop_start = time.perf_counter()
 
@@ -194,13 +194,13 @@ class IntelligentMCPHandler:
             elapsed = time.perf_counter() - loop_start
             if elapsed > self.TOTAL_TIMEOUT_SECONDS:
                 timeout_msg = f"⏱️ Multi-tool timeout ({self.TOTAL_TIMEOUT_SECONDS}s) reached after {iteration - 1} tool call(s)."
-                print(timeout_msg)
+                logger.warning(timeout_msg)
                 interaction_trace["final_answer"] = self._synthesize_from_accumulated(
                     question, prior_tool_results, llama_client, timeout_msg
                 )
                 return interaction_trace if include_trace else interaction_trace["final_answer"]
 
-            print(f"\n--- Iteration {iteration}/{self.MAX_TOOL_ITERATIONS} ---")
+            logger.info("--- Iteration %d/%d ---", iteration, self.MAX_TOOL_ITERATIONS)
 
             # Ask the LLM (with accumulated prior results for iterations > 1)
             response = llama_client.generate_with_tools(
@@ -219,12 +219,13 @@ class IntelligentMCPHandler:
                 "tool_execution": None,
             }
 
-            print(f"🤖 LLM Response (iter {iteration}): {content[:200]}...")
-            print(f"🔧 Needs tool call: {needs_tool}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🤖 LLM Response (iter %d): %s...", iteration, content[:200])
+            logger.info("🔧 Needs tool call: %s", needs_tool)
 
             if not needs_tool:
                 # LLM has answered — we're done
-                print(f"✅ LLM answered directly on iteration {iteration}")
+                logger.info("✅ LLM answered directly on iteration %d", iteration)
                 iter_record["final"] = True
                 interaction_trace["iterations"].append(iter_record)
                 interaction_trace["final_answer"] = content
@@ -234,7 +235,7 @@ class IntelligentMCPHandler:
             tool_call = self.parse_tool_call(content)
             if not tool_call:
                 error_msg = f"❌ Could not parse tool call from response (iter {iteration}): {content[:200]}"
-                print(error_msg)
+                logger.warning(error_msg)
                 iter_record["error"] = error_msg
                 interaction_trace["iterations"].append(iter_record)
                 # If we have prior results, try to synthesize anyway
@@ -249,9 +250,9 @@ class IntelligentMCPHandler:
             iter_record["tool_call"] = tool_call
 
             # Dedup check
-            call_key = (tool_call["name"], json.dumps(tool_call.get("arguments", {}), sort_keys=True))
+            call_key = (tool_call["name"], _freeze(tool_call.get("arguments", {})))
             if call_key in seen_calls:
-                print(f"⚠️ Duplicate tool call detected: {tool_call['name']} — stopping loop")
+                logger.info("⚠️ Duplicate tool call detected: %s — stopping loop", tool_call["name"])
                 interaction_trace["iterations"].append(iter_record)
                 interaction_trace["final_answer"] = self._synthesize_from_accumulated(
                     question, prior_tool_results, llama_client, "Duplicate tool call detected"
@@ -260,7 +261,7 @@ class IntelligentMCPHandler:
             seen_calls.add(call_key)
 
             # Execute the tool
-            print(f"🔧 Calling tool: {tool_call['name']} with args: {tool_call.get('arguments', {})}")
+            logger.info("🔧 Calling tool: %s with args: %s", tool_call["name"], tool_call.get("arguments", {}))
             tool_start = time.perf_counter()
             tool_execution = self.execute_tool_call(tool_call)
             tool_execution["latency_seconds"] = time.perf_counter() - tool_start
@@ -268,7 +269,8 @@ class IntelligentMCPHandler:
             interaction_trace["iterations"].append(iter_record)
 
             formatted = tool_execution.get("formatted_result", "")
-            print(f"📊 Tool result (first 200 chars): {str(formatted)[:200]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Tool result (first 200 chars): %s...", str(formatted)[:200])
 
             if tool_execution.get("error"):
                 # Tool error is non-fatal; accumulate the error and let LLM continue
@@ -285,7 +287,7 @@ class IntelligentMCPHandler:
             })
 
         # Exhausted max iterations — synthesize from what we have
-        print(f"⚠️ Reached max iterations ({self.MAX_TOOL_ITERATIONS})")
+        logger.info("⚠️ Reached max iterations (%d)", self.MAX_TOOL_ITERATIONS)
         interaction_trace["final_answer"] = self._synthesize_from_accumulated(
             question, prior_tool_results, llama_client, "Max iterations reached"
         )
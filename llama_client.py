@@ -1,7 +1,6 @@
 import os
 from typing import List, Dict, Any, Optional, Union
 
-import google.generativeai as genai
 from dotenv import load_dotenv
 load_dotenv()
 from config import config
@@ -12,6 +11,11 @@ class LlamaClient:
     """Client for interacting with Gemini models via the Google Generative AI API."""
 
     def __init__(self, model_name: Optional[str] = None):
+        # Deferred import: google.generativeai is heavy and only needed once a
+        # client is actually constructed (tests and CLI helpers import this
+        # module without ever talking to the API).
+        import google.generativeai as genai
+
         self.config = config
         self.model_name = model_name or self.config.get('model.name', 'gemini-1.5-pro-latest')
         self.system_prompt_variant = self.config.get('prompts.system_prompt_variant', 'tool_use_reasoned')
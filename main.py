@@ -4,6 +4,7 @@ Local LLM with MCP Tools - Main Application
 """
 
 import sys
+import logging
 from typing import Optional
 import argparse
 
@@ -209,6 +210,9 @@ class LocalLLMApp:
 
 def main():
     """Main entry point."""
+    # Surface the fetchers'/tool loop's INFO progress logging in the CLI
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     parser = argparse.ArgumentParser(description="Local LLM with MCP Tools")
     parser.add_argument("--setup", action="store_true", help="Run setup mode")
     parser.add_argument("--question", "-q", type=str, help="Ask a single question")
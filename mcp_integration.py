@@ -7,8 +7,11 @@ It uses a domain registry so new data domains (census, property, etc.) can be
 added without modifying this file.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from base_domain import BaseDataDomain
@@ -18,14 +21,51 @@ from census_mcp import CensusDataMCP
 from socioeconomic_mcp import SocioeconomicDataMCP
 from property_mcp import PropertyDataMCP
 
+# key=value tokens for the legacy /mcp CLI argument syntax
+_KV_RE = re.compile(r"(\w+)=(\S+)")
+_BOOL_MAP = {"true": True, "false": False}
+
+
+def _single_arg_advanced_query(args_text: str) -> Dict[str, Any]:
+    if args_text.isdigit():
+        # Could be year or ward - assume year for single number
+        year = int(args_text)
+        return {"start_year": year, "end_year": year}
+    # Could be location type or other string parameter
+    return {"location_type": args_text}
+
+
+# Dispatch table for the single-bare-argument fallback in parse_mcp_command:
+# maps tool name -> handler(args_text) -> arguments dict
+_SINGLE_ARG_HANDLERS: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "get_iucr_info": lambda args_text: {"iucr_code": args_text},
+    "query_homicides_advanced": _single_arg_advanced_query,
+}
+
 
 class MCPIntegration:
     """Integration layer for MCP tools in the Llama RAG system."""
 
+    # Fixed attribute set — dropping the per-instance __dict__ makes the
+    # hot-path attribute loads in call_tool/format_tool_result a touch
+    # cheaper and trims a little memory
+    __slots__ = (
+        "domains",
+        "_tool_domain_map",
+        "_tool_handlers",
+        "_tools_info_cache",
+        "_all_tool_defs",
+    )
+
     def __init__(self):
         self.domains: Dict[str, BaseDataDomain] = {}
-        # Maps tool_name -> domain_name for fast dispatch
+        # Maps tool_name -> domain_name (kept for error messages/formatting)
         self._tool_domain_map: Dict[str, str] = {}
+        # Maps tool_name -> bound domain.call_tool for one-hop dispatch
+        self._tool_handlers: Dict[str, Callable[[str, Dict[str, Any]], Dict[str, Any]]] = {}
+        # Lazily built tool-catalogue caches, invalidated on register_domain
+        self._tools_info_cache: Optional[List[Dict[str, str]]] = None
+        self._all_tool_defs: Optional[List[Dict[str, Any]]] = None
         self.initialize_mcp_tools()
 
     # ------------------------------------------------------------------
@@ -35,8 +75,16 @@ class MCPIntegration:
     def register_domain(self, domain: BaseDataDomain) -> None:
         """Register a data domain and index its tools."""
         self.domains[domain.domain_name] = domain
+        # Intern the (small, fixed) tool-name vocabulary so hot-path dict
+        # lookups compare by pointer instead of character-by-character
+        domain_name = sys.intern(domain.domain_name)
         for tool_name in domain.get_tool_names():
-            self._tool_domain_map[tool_name] = domain.domain_name
+            interned = sys.intern(tool_name)
+            self._tool_domain_map[interned] = domain_name
+            self._tool_handlers[interned] = domain.call_tool
+        # Invalidate catalogue caches — rebuilt lazily on next access
+        self._tools_info_cache = None
+        self._all_tool_defs = None
         print(f"  ✅ Registered domain '{domain.domain_name}' with {len(domain.get_tool_names())} tools")
 
     # ------------------------------------------------------------------
@@ -44,59 +92,48 @@ class MCPIntegration:
     # ------------------------------------------------------------------
 
     def initialize_mcp_tools(self):
-        """Initialize MCP tools and data sources."""
-        try:
-            self._init_homicide_domain()
-            self._init_census_domain()
-            self._init_socioeconomic_domain()
-            self._init_property_domain()
-            total_tools = len(self._tool_domain_map)
-            print(f"✅ MCP initialized with {total_tools} tools across {len(self.domains)} domain(s)")
-        except Exception as e:
-            print(f"❌ Error initializing MCP tools: {e}")
+        """Initialize MCP tools and data sources.
 
-    def _init_homicide_domain(self):
-        """Bootstrap the homicide domain."""
-        csv_path = Path("./knowledge_base/Homicides_2001_to_present.csv")
+        Domains are created from a data-driven factory table — adding a new
+        domain means adding one (name, factory) entry, and each factory
+        failure is isolated to its own domain.
+
+        The factories are run on a small thread pool so their network I/O
+        (Socrata fetches on a cold cache) overlaps; registration itself
+        happens on this thread, in table order, to keep the registry
+        dicts single-threaded and the tool ordering deterministic.
+        """
+        factories = (
+            ("homicide", self._build_homicide_domain),
+            ("census", CensusDataMCP),
+            ("socioeconomic", SocioeconomicDataMCP),
+            ("property", PropertyDataMCP),
+        )
+        with ThreadPoolExecutor(max_workers=len(factories)) as executor:
+            futures = [(name, executor.submit(factory)) for name, factory in factories]
+            for name, future in futures:
+                try:
+                    domain = future.result()
+                    if domain is not None:
+                        self.register_domain(domain)
+                except Exception as e:
+                    print(f"⚠️  Unable to load {name} domain: {e}")
+        total_tools = len(self._tool_domain_map)
+        print(f"✅ MCP initialized with {total_tools} tools across {len(self.domains)} domain(s)")
 
-        # Try API first, fall back to CSV
+    def _build_homicide_domain(self) -> Optional[BaseDataDomain]:
+        """Build the homicide domain (API first, CSV fallback)."""
+        csv_path = Path("./knowledge_base/Homicides_2001_to_present.csv")
         try:
             fetcher = ChicagoHomicideDataFetcher()
             api_df = fetcher.fetch_all_data()
-            domain = HomicideDataMCP(str(csv_path), data_fetcher=fetcher, preloaded_df=api_df)
+            return HomicideDataMCP(str(csv_path), data_fetcher=fetcher, preloaded_df=api_df)
         except Exception as api_error:
             print(f"⚠️  Unable to load homicide data from API: {api_error}")
             if csv_path.exists():
-                domain = HomicideDataMCP(str(csv_path))
-            else:
-                print(f"⚠️ Homicide CSV not found at {csv_path}")
-                return
-
-        self.register_domain(domain)
-
-    def _init_census_domain(self):
-        """Bootstrap the census/demographics domain."""
-        try:
-            domain = CensusDataMCP()
-            self.register_domain(domain)
-        except Exception as e:
-            print(f"⚠️  Unable to load census domain: {e}")
-
-    def _init_socioeconomic_domain(self):
-        """Bootstrap the socioeconomic indicators domain."""
-        try:
-            domain = SocioeconomicDataMCP()
-            self.register_domain(domain)
-        except Exception as e:
-            print(f"⚠️  Unable to load socioeconomic domain: {e}")
-
-    def _init_property_domain(self):
-        """Bootstrap the property sales domain."""
-        try:
-            domain = PropertyDataMCP()
-            self.register_domain(domain)
-        except Exception as e:
-            print(f"⚠️  Unable to load property domain: {e}")
+                return HomicideDataMCP(str(csv_path))
+            print(f"⚠️ Homicide CSV not found at {csv_path}")
+            return None
 
     # ------------------------------------------------------------------
     # Backward-compatible helpers
@@ -117,24 +154,32 @@ class MCPIntegration:
     # ------------------------------------------------------------------
 
     def get_available_tools(self) -> List[Dict[str, str]]:
-        """Get list of available MCP tools across all domains."""
-        tools_info: List[Dict[str, str]] = []
-        for domain in self.domains.values():
-            for tdef in domain.get_tool_definitions():
-                tools_info.append({
-                    "name": tdef["name"],
-                    "description": tdef["description"],
-                    "domain": domain.domain_name,
-                    "usage": f"Use /mcp {tdef['name']} to call this tool",
-                })
-        return tools_info
+        """Get list of available MCP tools across all domains.
+
+        The catalogue is static after init, so the flat list is built once
+        and memoized until another domain registers.
+        """
+        if self._tools_info_cache is None:
+            tools_info: List[Dict[str, str]] = []
+            for domain in self.domains.values():
+                for tdef in domain.get_tool_definitions():
+                    tools_info.append({
+                        "name": tdef["name"],
+                        "description": tdef["description"],
+                        "domain": domain.domain_name,
+                        "usage": f"Use /mcp {tdef['name']} to call this tool",
+                    })
+            self._tools_info_cache = tools_info
+        return self._tools_info_cache
 
     def get_all_tool_definitions(self) -> List[Dict[str, Any]]:
-        """Collect tool definitions from every registered domain."""
-        defs: List[Dict[str, Any]] = []
-        for domain in self.domains.values():
-            defs.extend(domain.get_tool_definitions())
-        return defs
+        """Collect tool definitions from every registered domain (memoized)."""
+        if self._all_tool_defs is None:
+            defs: List[Dict[str, Any]] = []
+            for domain in self.domains.values():
+                defs.extend(domain.get_tool_definitions())
+            self._all_tool_defs = defs
+        return self._all_tool_defs
 
     # ------------------------------------------------------------------
     # Tool dispatch
@@ -142,13 +187,12 @@ class MCPIntegration:
 
     def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Route a tool call to the owning domain."""
-        domain_name = self._tool_domain_map.get(tool_name)
-        if domain_name is None:
+        handler = self._tool_handlers.get(tool_name)
+        if handler is None:
             available = ", ".join(self._tool_domain_map.keys()) or "(none)"
             return {"error": f"Tool '{tool_name}' not found. Available tools: {available}"}
-        domain = self.domains[domain_name]
         try:
-            return domain.call_tool(tool_name, arguments)
+            return handler(tool_name, arguments)
         except Exception as e:
             return {"error": f"Error calling tool '{tool_name}': {str(e)}"}
     
@@ -157,23 +201,16 @@ class MCPIntegration:
     # ------------------------------------------------------------------
 
     def format_tool_result(self, result: Dict[str, Any], tool_name: str = None) -> str:
-        """Delegate formatting to the owning domain."""
-        # Determine which domain produced this result
-        domain = None
+        """Delegate formatting to the owning domain.
+
+        The tool→domain map is authoritative, so an unmapped (or missing)
+        tool name falls straight through to generic JSON instead of probing
+        every domain's formatter and swallowing exceptions.
+        """
         if tool_name:
             domain_name = self._tool_domain_map.get(tool_name)
             if domain_name:
-                domain = self.domains.get(domain_name)
-
-        if domain is not None:
-            return domain.format_result(result)
-
-        # Fallback: try each domain, or generic JSON
-        for d in self.domains.values():
-            try:
-                return d.format_result(result)
-            except Exception:
-                continue
+                return self.domains[domain_name].format_result(result)
         return f"📋 **Result:**\n```json\n{json.dumps(result, indent=2)}\n```"
 
     # ------------------------------------------------------------------
@@ -187,47 +224,36 @@ class MCPIntegration:
             if len(parts) < 1:
                 return None, None
             
-            tool_name = parts[0]
-            
+            tool_name = sys.intern(parts[0])
+
             # Parse arguments (simple key=value format or JSON)
             arguments = {}
             if len(parts) > 1:
                 args_text = parts[1].strip()
                 
-                # Try to parse as JSON first
-                try:
-                    arguments = json.loads(args_text)
-                except json.JSONDecodeError:
-                    # Parse as simple key=value pairs
+                # Only probe for JSON when the text could actually be JSON —
+                # the dominant key=value CLI path skips the raise/catch cost
+                parsed_json = False
+                if args_text[:1] in ('{', '['):
+                    try:
+                        arguments = json.loads(args_text)
+                        parsed_json = True
+                    except json.JSONDecodeError:
+                        parsed_json = False
+                if not parsed_json:
+                    # Parse as simple key=value pairs in one pass
                     if '=' in args_text:
-                        for pair in args_text.split():
-                            if '=' in pair:
-                                key, value = pair.split('=', 1)
-                                # Try to convert to appropriate type
-                                try:
-                                    # Try integer
-                                    if value.isdigit():
-                                        arguments[key] = int(value)
-                                    # Try boolean
-                                    elif value.lower() in ('true', 'false'):
-                                        arguments[key] = value.lower() == 'true'
-                                    else:
-                                        arguments[key] = value
-                                except:
-                                    arguments[key] = value
+                        for match in _KV_RE.finditer(args_text):
+                            key, value = match.group(1), match.group(2)
+                            if value.lstrip('-').isdigit():
+                                arguments[key] = int(value)
+                            else:
+                                arguments[key] = _BOOL_MAP.get(value.lower(), value)
                     else:
                         # Single argument, assume it's for the first parameter
-                        if tool_name == "get_iucr_info":
-                            arguments["iucr_code"] = args_text
-                        elif tool_name == "query_homicides_advanced":
-                            # For advanced queries, try to parse simple patterns
-                            if args_text.isdigit():
-                                # Could be year or ward - assume year for single number
-                                arguments["start_year"] = int(args_text)
-                                arguments["end_year"] = int(args_text)
-                            else:
-                                # Could be location type or other string parameter
-                                arguments["location_type"] = args_text
+                        handler = _SINGLE_ARG_HANDLERS.get(tool_name)
+                        if handler:
+                            arguments = handler(args_text)
             
             return tool_name, arguments
             
@@ -5,8 +5,9 @@ property sales) with iterative multi-tool orchestration — the LLM can
 request up to 4 sequential tool calls before synthesizing a final answer.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import json
+import string
 
 PROMPT_VARIANTS: Dict[str, Dict[str, Any]] = {
     "tool_use_v1": {
@@ -164,6 +165,75 @@ def _format_examples(examples: List[Any]) -> List[str]:
     return formatted
 
 
+# Pre-render the per-variant static sections once at import — guidelines and
+# examples never change at runtime, so no prompt build should re-serialize them.
+for _variant_config in PROMPT_VARIANTS.values():
+    _guidelines = [str(rule) for rule in _variant_config.get("guidelines", [])]
+    _variant_config["_guidelines_section"] = (
+        "\n".join(f"- {rule}" for rule in _guidelines)
+        if _guidelines else "- Follow standard best practices."
+    )
+    _example_lines = _format_examples(_variant_config.get("examples", []))
+    _variant_config["_examples_section"] = (
+        "\n".join(_example_lines) if _example_lines else "(No examples configured)"
+    )
+    # Parse the template's literal segments and placeholder names once so
+    # prompt assembly is a plain join instead of a str.format() re-parse.
+    _variant_config["_compiled_template"] = [
+        (literal, field)
+        for literal, field, _spec, _conv in string.Formatter().parse(
+            _variant_config["template"]
+        )
+    ]
+del _variant_config
+
+
+# Rendered sections and finished prompts, keyed on variant + tool fingerprint
+# (+ prior-results tuple for full prompts).  The tool catalogue is static
+# after init, so these hold a handful of entries; cleared if they ever grow.
+_SECTION_CACHE: Dict[Tuple[str, Tuple], Tuple[str, str, str]] = {}
+_PROMPT_CACHE: Dict[Tuple, str] = {}
+_CACHE_MAX = 64
+
+
+def _tools_cache_key(tools: List[Dict[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """Hashable fingerprint of a tool list (name + description per tool)."""
+    return tuple((t.get("name", ""), t.get("description", "")) for t in tools)
+
+
+def _static_sections(
+    variant: str,
+    tools: List[Dict[str, Any]],
+    tools_key: Tuple[Tuple[str, str], ...],
+) -> Tuple[str, str, str]:
+    """Render the (variant, tools)-invariant prompt sections once.
+
+    The tool summaries, guidelines, and examples don't change between
+    iterations of the multi-tool loop, so they're memoized on the variant
+    name plus a fingerprint of the tool definitions.  Only the prior-results
+    section is rebuilt per call.
+    """
+    cache_key = (variant, tools_key)
+    cached = _SECTION_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    variant_config = PROMPT_VARIANTS.get(variant, PROMPT_VARIANTS["tool_use_v1"])
+
+    tool_lines = [_summarize_tool(tool) for tool in tools] if tools else ["- No tools available"]
+    tool_section = "\n".join(tool_lines)
+
+    sections = (
+        tool_section,
+        variant_config["_guidelines_section"],
+        variant_config["_examples_section"],
+    )
+    if len(_SECTION_CACHE) >= _CACHE_MAX:
+        _SECTION_CACHE.clear()
+    _SECTION_CACHE[cache_key] = sections
+    return sections
+
+
 def build_tool_system_prompt(
     variant: str,
     tools: List[Dict[str, Any]],
@@ -181,17 +251,22 @@ def build_tool_system_prompt(
         Results from previous tool calls in this orchestration loop.
         Each dict has ``tool_name`` and ``formatted_result`` keys.
     """
-    variant_config = PROMPT_VARIANTS.get(variant, PROMPT_VARIANTS["tool_use_v1"])
-
-    tool_lines = [_summarize_tool(tool) for tool in tools] if tools else ["- No tools available"]
-    tool_section = "\n".join(tool_lines)
+    tools_key = _tools_cache_key(tools)
+    prior_key: Tuple = ()
+    if prior_tool_results:
+        prior_key = tuple(
+            (pr["tool_name"], pr["formatted_result"]) for pr in prior_tool_results
+        )
+    prompt_cache_key = (variant, tools_key, prior_key)
+    cached_prompt = _PROMPT_CACHE.get(prompt_cache_key)
+    if cached_prompt is not None:
+        return cached_prompt
 
-    guidelines = [str(rule) for rule in variant_config.get("guidelines", [])]
-    guidelines_section = "\n".join(f"- {rule}" for rule in guidelines) if guidelines else "- Follow standard best practices."
+    variant_config = PROMPT_VARIANTS.get(variant, PROMPT_VARIANTS["tool_use_v1"])
 
-    example_entries = variant_config.get("examples", [])
-    example_lines = _format_examples(example_entries)
-    examples_section = "\n".join(example_lines) if example_lines else "(No examples configured)"
+    tool_section, guidelines_section, examples_section = _static_sections(
+        variant, tools, tools_key
+    )
 
     # Build prior results section (multi-tool loop context)
     prior_results_section = ""
@@ -207,10 +282,20 @@ def build_tool_system_prompt(
         )
         prior_results_section = "\n".join(parts)
 
-    template = variant_config.get("template", PROMPT_VARIANTS["tool_use_v1"]["template"])
-    return template.format(
-        tool_summaries=tool_section,
-        guidelines=guidelines_section,
-        examples=examples_section,
-        prior_results_section=prior_results_section,
-    )
+    fields = {
+        "tool_summaries": tool_section,
+        "guidelines": guidelines_section,
+        "examples": examples_section,
+        "prior_results_section": prior_results_section,
+    }
+    parts: List[str] = []
+    for literal, field in variant_config["_compiled_template"]:
+        if literal:
+            parts.append(literal)
+        if field is not None:
+            parts.append(fields.get(field, ""))
+    prompt = "".join(parts)
+    if len(_PROMPT_CACHE) >= _CACHE_MAX:
+        _PROMPT_CACHE.clear()
+    _PROMPT_CACHE[prompt_cache_key] = prompt
+    return prompt
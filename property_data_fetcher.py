@@ -9,21 +9,59 @@ Strategy: SoQL server-side aggregation by township_code + year so
           we transfer ~80 rows instead of millions.
 """
 
-import requests
+import json
+
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import Optional
 
 from base_fetcher import BaseSocrataFetcher
 
+# orjson decodes the Socrata payload several times faster than stdlib json;
+# fall back transparently when it isn't installed.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
 
 class PropertyDataFetcher(BaseSocrataFetcher):
     """Fetch aggregated Chicago residential property sales data."""
 
     DATASET_ID = "wvhk-k5uv"
+
+    # ~80 aggregated rows, read on every cold start: zstd compresses the
+    # cache harder than snappy, and Arrow-backed columns give the query
+    # layer zero-copy access plus faster string/isin kernels
+    PARQUET_COMPRESSION = "zstd"
+    PARQUET_DTYPE_BACKEND = "pyarrow"
+
     # Chicago's 8 townships
     CHICAGO_TOWNSHIPS = ("70", "71", "72", "73", "74", "75", "76", "77")
 
+    # The aggregation query is a compile-time constant — build it once at
+    # class scope so the cache-miss path goes straight to the network
+    _TWN_LIST = ",".join(f"'{t}'" for t in CHICAGO_TOWNSHIPS)
+    _WHERE = (
+        f"sale_price > 10000 AND class LIKE '2%' "
+        f"AND township_code IN ({_TWN_LIST})"
+    )
+    _PARAMS = {
+        "$select": (
+            "year, township_code, "
+            "count(*) as sales_count, "
+            "avg(sale_price) as avg_price, "
+            "min(sale_price) as min_price, "
+            "max(sale_price) as max_price, "
+            "sum(sale_price) as total_volume"
+        ),
+        "$where": _WHERE,
+        "$group": "year, township_code",
+        "$order": "year DESC, township_code",
+        "$limit": 500,
+    }
+
     def __init__(
         self,
         cache_dir: str = "./data/cache",
@@ -44,46 +82,56 @@ class PropertyDataFetcher(BaseSocrataFetcher):
     def fetch_all_data(self) -> Optional[pd.DataFrame]:
         """Fetch aggregated property sales grouped by township + year."""
         # Check cache first
-        if self.is_cache_valid():
+        cached = self.load_from_cache_if_fresh()
+        if cached is not None:
             print("📦 Using cached property sales data")
-            return self.load_from_cache()
+            return cached
 
         print(f"🌐 Fetching aggregated property data from {self.base_domain}...")
-        twn_list = ",".join(f"'{t}'" for t in self.CHICAGO_TOWNSHIPS)
-        where_clause = (
-            f"sale_price > 10000 AND class LIKE '2%' "
-            f"AND township_code IN ({twn_list})"
-        )
-        params = {
-            "$select": (
-                "year, township_code, "
-                "count(*) as sales_count, "
-                "avg(sale_price) as avg_price, "
-                "min(sale_price) as min_price, "
-                "max(sale_price) as max_price, "
-                "sum(sale_price) as total_volume"
-            ),
-            "$where": where_clause,
-            "$group": "year, township_code",
-            "$order": "year DESC, township_code",
-            "$limit": 500,
-        }
         url = self.get_resource_url()
         try:
-            r = requests.get(url, params=params, timeout=30)
+            r = self._session.get(url, params=self._PARAMS, timeout=30)
             r.raise_for_status()
-            data = r.json()
+            # Decode straight from the UTF-8 bytes — skips requests' charset
+            # detection and, with orjson, the stdlib parser entirely
+            if orjson is not None:
+                data = orjson.loads(r.content)
+            else:
+                data = json.loads(r.content)
             if not isinstance(data, list) or not data:
                 print("  ⚠️ No property data returned")
                 return None
-            df = pd.DataFrame(data)
-            # Convert types
-            for col in ("year", "sales_count"):
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
-            for col in ("avg_price", "min_price", "max_price", "total_volume"):
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors="coerce")
+            # Columnar construction instead of pandas' per-dict inference path
+            df = self._records_to_dataframe(data)
+            # Convert types — Socrata sends numerics as JSON strings, so
+            # parse each column in one C-level pass straight from the raw
+            # records into typed buffers instead of cell-wise to_numeric
+            int_cols = [c for c in ("year", "sales_count") if c in df.columns]
+            float_cols = [
+                c for c in ("avg_price", "min_price", "max_price", "total_volume")
+                if c in df.columns
+            ]
+            n = len(data)
+            try:
+                for col in int_cols:
+                    df[col] = np.fromiter(
+                        (int(row[col]) for row in data), dtype=np.int32, count=n
+                    )
+                for col in float_cols:
+                    df[col] = np.fromiter(
+                        (
+                            float(v) if (v := row.get(col)) is not None else np.nan
+                            for row in data
+                        ),
+                        dtype=np.float64,
+                        count=n,
+                    )
+            except (KeyError, TypeError, ValueError):
+                # Ragged/odd payload — fall back to pandas' coercion
+                if int_cols:
+                    df[int_cols] = df[int_cols].apply(pd.to_numeric, errors="coerce").astype("Int64")
+                if float_cols:
+                    df[float_cols] = df[float_cols].apply(pd.to_numeric, errors="coerce")
             print(f"  ✅ Retrieved {len(df)} aggregated rows")
             self.save_to_cache(df)
             return df
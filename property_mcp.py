@@ -8,15 +8,42 @@ at the township level (8 townships covering all 77 community areas), so
 per-community-area figures are approximate.
 """
 
+import functools
+import importlib.util
 import json
+import re
+
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Pattern, Tuple
 
 from base_domain import BaseDataDomain
 from property_data_fetcher import PropertyDataFetcher
 
-
+# pandas' numba groupby kernels beat the Cython ones for mean/sum once the
+# JIT is warm; use them when numba is installed, silently skip otherwise
+_USE_NUMBA = importlib.util.find_spec("numba") is not None
+
+# pyahocorasick (C extension) finds every known name in one pass over the
+# input; the compiled regex alternation remains the fallback
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on environment
+    ahocorasick = None
+
+# (result key, display label, format) rows for the per-area section of
+# _format_property_result — a table walk instead of five if-blocks
+_AREA_FIELDS = (
+    ("avg_price", "Avg Sale Price", "${:,}"),
+    ("min_price", "Min Sale Price", "${:,}"),
+    ("max_price", "Max Sale Price", "${:,}"),
+    ("sales_count", "Sales Count", "{:,}"),
+    ("total_volume", "Total Volume", "${:,}"),
+)
+
+
+@functools.lru_cache(maxsize=1)
 def _load_community_area_lookup() -> Dict:
     path = Path("knowledge_base/community_areas.json")
     if not path.exists():
@@ -25,6 +52,54 @@ def _load_community_area_lookup() -> Dict:
         return json.load(f)
 
 
+@functools.lru_cache(maxsize=1)
+def _lookup_maps() -> Tuple[Dict[int, str], Dict[str, int], Optional[Pattern]]:
+    """Derive (and cache) the resolution maps from the lookup JSON.
+
+    The JSON and these dicts never change at runtime, so they are built
+    once per process instead of once per PropertyDataMCP instance.
+    Treated as read-only by all consumers.
+    """
+    ca_lookup = _load_community_area_lookup()
+
+    ca_to_township: Dict[int, str] = {}
+    for twn_code, info in ca_lookup.get("townships", {}).items():
+        if twn_code.startswith("_"):
+            continue
+        for ca_num in info.get("community_areas", []):
+            ca_to_township[ca_num] = twn_code
+
+    name_to_num: Dict[str, int] = {}
+    for num_str, name in ca_lookup.get("areas", {}).items():
+        name_to_num[name.lower()] = int(num_str)
+    for alias, num in ca_lookup.get("aliases", {}).items():
+        name_to_num[alias.lower()] = int(num)
+
+    name_pattern = re.compile(
+        "|".join(
+            re.escape(k)
+            for k in sorted(name_to_num, key=len, reverse=True)
+        )
+    ) if name_to_num else None
+
+    return ca_to_township, name_to_num, name_pattern
+
+
+@functools.lru_cache(maxsize=1)
+def _name_automaton():
+    """Aho-Corasick automaton over every name/alias (None without the lib)."""
+    if ahocorasick is None:
+        return None
+    _, name_to_num, _ = _lookup_maps()
+    if not name_to_num:
+        return None
+    automaton = ahocorasick.Automaton()
+    for name, num in name_to_num.items():
+        automaton.add_word(name, (num, name))
+    automaton.make_automaton()
+    return automaton
+
+
 class PropertyDataMCP(BaseDataDomain):
     """MCP domain for Chicago residential property sales."""
 
@@ -33,22 +108,26 @@ class PropertyDataMCP(BaseDataDomain):
         self.df: Optional[pd.DataFrame] = None
         self._ca_lookup = _load_community_area_lookup()
 
-        # Build reverse map: community area number → township code
-        self._ca_to_township: Dict[int, str] = {}
-        for twn_code, info in self._ca_lookup.get("townships", {}).items():
-            if twn_code.startswith("_"):
-                continue
-            for ca_num in info.get("community_areas", []):
-                self._ca_to_township[ca_num] = twn_code
+        # Resolution maps (CA number → township, name/alias → CA number,
+        # longest-first name alternation) are derived once per process
+        self._ca_to_township, self._name_to_num, self._name_pattern = _lookup_maps()
+        self._aho = _name_automaton()
+
+        # Both are pure functions of a short string and users re-query the
+        # same handful of neighborhoods — memoize per instance (256 easily
+        # covers the 77 areas plus aliases)
+        self._resolve_to_township = functools.lru_cache(maxsize=256)(self._resolve_to_township)
+        self._township_label = functools.lru_cache(maxsize=256)(self._township_label)
 
-        # Name → number lookup
-        self._name_to_num: Dict[str, int] = {}
-        for num_str, name in self._ca_lookup.get("areas", {}).items():
-            self._name_to_num[name.lower()] = int(num_str)
-        for alias, num in self._ca_lookup.get("aliases", {}).items():
-            self._name_to_num[alias.lower()] = int(num)
+        # Per-year slices and the all-Chicago trend, precomputed at load
+        # time — self.df is static afterwards, so queries can dict-lookup a
+        # year instead of re-scanning the frame
+        self._by_year: Dict[int, pd.DataFrame] = {}
+        self._trend_all: Optional[pd.DataFrame] = None
+        self._available_years: List[int] = []
 
-        self.load_data()
+        # Data loads lazily on the first tool call
+        self._load_attempted = False
 
     # ------------------------------------------------------------------
     # BaseDataDomain interface
@@ -58,10 +137,41 @@ class PropertyDataMCP(BaseDataDomain):
     def domain_name(self) -> str:
         return "property_sales"
 
+    def _ensure_loaded(self) -> None:
+        """Trigger the data load on first use (at most one attempt)."""
+        if self.df is None and not self._load_attempted:
+            self.load_data()
+
     def load_data(self, **kwargs) -> bool:
         try:
+            self._load_attempted = True
             self.df = self.fetcher.fetch_all_data()
             if self.df is not None and not self.df.empty:
+                if "township_code" in self.df.columns:
+                    # 8 distinct codes — categorical turns isin/== filters
+                    # into int8 compares and shrinks the column
+                    self.df["township_code"] = self.df["township_code"].astype("category")
+                # year must never be NaN — drop any such rows up front so
+                # the int16 cast below always holds and queries never need
+                # dropna/int() coercion on the column again
+                if "year" in self.df.columns:
+                    self.df = self.df.dropna(subset=["year"]).reset_index(drop=True)
+                # Halve the bytes the filters/groupbys move: these values
+                # all fit comfortably in 32 (or 16) bits.  total_volume
+                # stays float64 — yearly sums run past float32 precision.
+                for col, dtype in (
+                    ("year", "int16"),
+                    ("sales_count", "int32"),
+                    ("avg_price", "float32"),
+                    ("min_price", "float32"),
+                    ("max_price", "float32"),
+                ):
+                    if col in self.df.columns:
+                        try:
+                            self.df[col] = self.df[col].astype(dtype)
+                        except (TypeError, ValueError):
+                            pass
+                self._build_indexes()
                 print(f"  ✅ Property data loaded: {len(self.df)} aggregated rows")
                 return True
             print("  ⚠️ Property data is empty")
@@ -70,6 +180,35 @@ class PropertyDataMCP(BaseDataDomain):
             print(f"  ⚠️ Property data load failed: {e}")
             return False
 
+    def _build_indexes(self) -> None:
+        """Precompute query accelerators over the freshly loaded frame.
+
+        Each per-year slice is indexed by township code (the column is
+        kept too), so a (year, township) lookup is two hash probes with no
+        boolean scans — the flat ``self.df`` stays as-is for the trend
+        pre-aggregate.
+        """
+        assert self.df is not None
+        self._by_year = {
+            int(y): g.set_index("township_code", drop=False)
+            for y, g in self.df.groupby("year", sort=False)
+        }
+        self._available_years = sorted(self._by_year)
+        self._trend_all = (
+            self.df.groupby("year", sort=True)
+            .agg(avg_price=("avg_price", "mean"), total_sales=("sales_count", "sum"))
+            .reset_index()
+        )
+        if _USE_NUMBA:
+            # Warm the JIT kernels here so the first trend query doesn't
+            # pay the compile cost
+            try:
+                gb = self.df.groupby("year", sort=True)
+                gb["avg_price"].mean(engine="numba")
+                gb["sales_count"].sum(engine="numba")
+            except Exception:
+                pass
+
     def get_tool_definitions(self) -> List[Dict[str, Any]]:
         return [
             {
@@ -113,6 +252,7 @@ class PropertyDataMCP(BaseDataDomain):
         ]
 
     def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        self._ensure_loaded()
         if tool_name == "query_property_values":
             return self.query_property_values(
                 community_area=arguments.get("community_area"),
@@ -157,9 +297,22 @@ class PropertyDataMCP(BaseDataDomain):
         if ca_num is not None:
             return self._ca_to_township.get(ca_num)
 
-        # Substring match
+        # Substring match: known name inside the input — one automaton pass
+        # (longest hit wins), or one regex scan without pyahocorasick ...
+        if self._aho is not None:
+            best = None
+            for _end, (num, name) in self._aho.iter(lower):
+                if best is None or len(name) > len(best[1]):
+                    best = (num, name)
+            if best is not None:
+                return self._ca_to_township.get(best[0])
+        elif self._name_pattern is not None:
+            m = self._name_pattern.search(lower)
+            if m:
+                return self._ca_to_township.get(self._name_to_num[m.group(0)])
+        # ... or the input inside a known name (partial names like "park")
         for known_lower, known_num in self._name_to_num.items():
-            if lower in known_lower or known_lower in lower:
+            if lower in known_lower:
                 return self._ca_to_township.get(known_num)
         return None
 
@@ -187,16 +340,22 @@ class PropertyDataMCP(BaseDataDomain):
         if self.df is None or self.df.empty:
             return {"error": "Property data not loaded"}
 
-        df = self.df.copy()
-        available_years = sorted(df["year"].dropna().unique())
+        # Read-only path: every filter below builds a new frame, so work on
+        # self.df directly instead of paying a full copy per query
+        df = self.df
+        # Years are static after load — read the precomputed list instead
+        # of re-running dropna/unique/sort per query
+        available_years = self._available_years or sorted(
+            int(y) for y in df["year"].dropna().unique()
+        )
         target_year = year if year and year in available_years else (
-            int(available_years[-1]) if available_years else None
+            available_years[-1] if available_years else None
         )
 
         result: Dict[str, Any] = {
             "data_source": "Cook County Assessor Parcel Sales (residential, $10k+)",
             "granularity": "township (approximate community area mapping)",
-            "available_years": [int(y) for y in available_years] if available_years else [],
+            "available_years": list(available_years),
         }
 
         # Resolve township(s)
@@ -209,36 +368,96 @@ class PropertyDataMCP(BaseDataDomain):
                     townships_to_query.append(twn)
                     resolved_labels[twn] = f"{ca} → {self._township_label(twn)}"
 
-        if metric == "price_trend" or metric == "trend":
-            result["trend"] = self._build_trend(df, townships_to_query or None)
-            return result
-
-        # Filter to target year for non-trend queries
-        if target_year is not None:
-            df = df[df["year"] == target_year]
-        result["year"] = int(target_year) if target_year else "all"
-
-        if townships_to_query:
-            area_df = df[df["township_code"].isin(townships_to_query)]
-            result["area_data"] = []
-            for twn in townships_to_query:
-                tdf = area_df[area_df["township_code"] == twn]
-                if tdf.empty:
-                    continue
-                row = tdf.iloc[0]
-                result["area_data"].append({
+        # Per-metric handlers build only the keys their metric needs
+        handler = _METRIC_HANDLERS.get(metric, PropertyDataMCP._query_all)
+        return handler(self, result, df, target_year, townships_to_query, resolved_labels, top_n)
+
+    # ------------------------------------------------------------------
+    # Per-metric query helpers
+    # ------------------------------------------------------------------
+
+    def _year_slice(self, df: pd.DataFrame, target_year: Optional[int]) -> pd.DataFrame:
+        """Slice to the target year — O(1) via the per-year dict built at
+        load time, with a scan fallback when the indexes are absent."""
+        if target_year is None:
+            return df
+        if self._by_year:
+            return self._by_year.get(int(target_year), df.iloc[0:0])
+        return df[df["year"] == target_year]
+
+    def _area_rows(self, df: pd.DataFrame, townships: List[str]):
+        """Yield (township, row dict) for each requested township.
+
+        Township lookup goes via the index (hash probe) instead of two
+        boolean scans per township.
+        """
+        by_town = df if df.index.name == "township_code" else df.set_index(
+            "township_code", drop=False
+        )
+        for twn in townships:
+            if twn not in by_town.index:
+                continue
+            sel = by_town.loc[twn]
+            if isinstance(sel, pd.DataFrame):  # defensive: duplicate rows
+                sel = sel.iloc[0]
+            # One row -> plain dict, instead of repeated Series.get calls
+            yield twn, sel.to_dict()
+
+    def _query_trend(self, result, df, target_year, townships, labels, top_n):
+        result["trend"] = self._build_trend(df, townships or None)
+        return result
+
+    def _query_sales_volume(self, result, df, target_year, townships, labels, top_n):
+        df = self._year_slice(df, target_year)
+        result["year"] = target_year if target_year is not None else "all"
+        if townships:
+            result["area_data"] = [
+                {
                     "township_code": twn,
-                    "label": resolved_labels.get(twn, self._township_label(twn)),
-                    "avg_price": self._safe_num(row.get("avg_price")),
-                    "min_price": self._safe_num(row.get("min_price")),
-                    "max_price": self._safe_num(row.get("max_price")),
-                    "sales_count": self._safe_int(row.get("sales_count")),
-                    "total_volume": self._safe_num(row.get("total_volume")),
-                })
+                    "label": labels.get(twn, self._township_label(twn)),
+                    "sales_count": self._safe_int(rec.get("sales_count")),
+                }
+                for twn, rec in self._area_rows(df, townships)
+            ]
         else:
-            # Ranking mode
-            result["ranking"] = self._build_ranking(df, metric, top_n)
+            result["ranking"] = self._build_ranking(df, "sales_volume", top_n)
+        return result
 
+    def _query_avg_price(self, result, df, target_year, townships, labels, top_n):
+        df = self._year_slice(df, target_year)
+        result["year"] = target_year if target_year is not None else "all"
+        if townships:
+            result["area_data"] = [
+                {
+                    "township_code": twn,
+                    "label": labels.get(twn, self._township_label(twn)),
+                    "avg_price": self._safe_num(rec.get("avg_price")),
+                    "sales_count": self._safe_int(rec.get("sales_count")),
+                }
+                for twn, rec in self._area_rows(df, townships)
+            ]
+        else:
+            result["ranking"] = self._build_ranking(df, "avg_price", top_n)
+        return result
+
+    def _query_all(self, result, df, target_year, townships, labels, top_n):
+        df = self._year_slice(df, target_year)
+        result["year"] = target_year if target_year is not None else "all"
+        if townships:
+            result["area_data"] = [
+                {
+                    "township_code": twn,
+                    "label": labels.get(twn, self._township_label(twn)),
+                    "avg_price": self._safe_num(rec.get("avg_price")),
+                    "min_price": self._safe_num(rec.get("min_price")),
+                    "max_price": self._safe_num(rec.get("max_price")),
+                    "sales_count": self._safe_int(rec.get("sales_count")),
+                    "total_volume": self._safe_num(rec.get("total_volume")),
+                }
+                for twn, rec in self._area_rows(df, townships)
+            ]
+        else:
+            result["ranking"] = self._build_ranking(df, "all", top_n)
         return result
 
     # ------------------------------------------------------------------
@@ -258,37 +477,76 @@ class PropertyDataMCP(BaseDataDomain):
         if sort_col not in df.columns:
             return {"note": f"Column '{sort_col}' not found"}
 
-        ranked = df.nlargest(min(top_n, len(df)), sort_col)
+        # Rank on the single sort column, project only the surviving rows,
+        # and round the whole value column in one vectorized pass
+        idx = df[sort_col].nlargest(min(top_n, len(df))).index
+        ranked = df.loc[idx]
+        towns = ranked["township_code"].astype(str).to_numpy()
+        values = self._round_prices(ranked[sort_col].to_numpy())
+        sales = (
+            ranked["sales_count"].to_numpy()
+            if "sales_count" in ranked.columns else None
+        )
         items = []
-        for _, row in ranked.iterrows():
-            twn = str(row.get("township_code", "?"))
+        for i, twn in enumerate(towns):
+            v = values[i]
             items.append({
                 "township_code": twn,
                 "label": self._township_label(twn),
-                "value": self._safe_num(row.get(sort_col)),
-                "sales_count": self._safe_int(row.get("sales_count")),
+                "value": None if np.isnan(v) else (int(v) if v > 100 else float(v)),
+                "sales_count": self._safe_int(sales[i]) if sales is not None else None,
             })
         return {"ranked_by": label, "top_n": top_n, "items": items}
 
     def _build_trend(self, df: pd.DataFrame, townships: Optional[List[str]] = None) -> Dict[str, Any]:
         """Year-over-year trend, optionally filtered to specific townships."""
         if townships:
-            df = df[df["township_code"].isin(townships)]
-        yearly = (
-            df.groupby("year")
-            .agg(avg_price=("avg_price", "mean"), total_sales=("sales_count", "sum"))
-            .reset_index()
-            .sort_values("year")
-        )
-        points = []
-        for _, row in yearly.iterrows():
-            points.append({
-                "year": int(row["year"]),
-                "avg_price": round(float(row["avg_price"])),
-                "total_sales": int(row["total_sales"]),
-            })
+            gb = df[df["township_code"].isin(townships)].groupby("year", sort=True)
+            yearly = None
+            if _USE_NUMBA:
+                try:
+                    avg = gb["avg_price"].mean(engine="numba")
+                    tot = gb["sales_count"].sum(engine="numba")
+                    yearly = pd.DataFrame({
+                        "year": avg.index,
+                        "avg_price": avg.to_numpy(),
+                        "total_sales": tot.to_numpy(),
+                    })
+                except Exception:
+                    yearly = None
+            if yearly is None:
+                yearly = (
+                    gb.agg(avg_price=("avg_price", "mean"), total_sales=("sales_count", "sum"))
+                    .reset_index()
+                )
+        elif self._trend_all is not None:
+            # All-Chicago trend was pre-aggregated at load time
+            yearly = self._trend_all
+        else:
+            yearly = (
+                df.groupby("year")
+                .agg(avg_price=("avg_price", "mean"), total_sales=("sales_count", "sum"))
+                .reset_index()
+                .sort_values("year")
+            )
+        # Pull the three columns out as arrays once — zip over NumPy scalars
+        # beats building a Series per row with iterrows
+        years = yearly["year"].to_numpy()
+        prices = yearly["avg_price"].to_numpy()
+        sales = yearly["total_sales"].to_numpy()
+        points = [
+            {"year": int(y), "avg_price": round(float(p)), "total_sales": int(s)}
+            for y, p, s in zip(years, prices, sales)
+        ]
         return {"townships": townships or "all Chicago", "data_points": points}
 
+    @staticmethod
+    def _round_prices(arr) -> np.ndarray:
+        """Vectorized counterpart of _safe_num: whole dollars above 100,
+        two decimals at or below — np.where does the split branchlessly."""
+        arr = np.asarray(arr, dtype=np.float64)
+        return np.where(arr > 100, np.rint(arr), np.round(arr, 2))
+
     @staticmethod
     def _safe_num(val):
         try:
@@ -309,47 +567,52 @@ class PropertyDataMCP(BaseDataDomain):
     # ------------------------------------------------------------------
 
     def _format_property_result(self, result: Dict[str, Any]) -> str:
-        lines: List[str] = []
-        lines.append("🏠 **Property Sales Data**")
-        lines.append(f"Source: {result.get('data_source', '?')}")
-        if "year" in result:
-            lines.append(f"Year: {result['year']}")
-        lines.append(f"Granularity: {result.get('granularity', '?')}")
-        lines.append("")
-
-        if "area_data" in result:
-            for area in result["area_data"]:
-                lines.append(f"### {area.get('label', '?')}")
-                if area.get("avg_price") is not None:
-                    lines.append(f"  Avg Sale Price: ${area['avg_price']:,}")
-                if area.get("min_price") is not None:
-                    lines.append(f"  Min Sale Price: ${area['min_price']:,}")
-                if area.get("max_price") is not None:
-                    lines.append(f"  Max Sale Price: ${area['max_price']:,}")
-                if area.get("sales_count") is not None:
-                    lines.append(f"  Sales Count: {area['sales_count']:,}")
-                if area.get("total_volume") is not None:
-                    lines.append(f"  Total Volume: ${area['total_volume']:,}")
-                lines.append("")
-
-        if "ranking" in result:
-            ranking = result["ranking"]
-            lines.append(f"**Ranking by {ranking.get('ranked_by', '?')} (Top {ranking.get('top_n', '?')}):**")
-            for i, item in enumerate(ranking.get("items", []), 1):
-                val = item.get("value")
-                val_str = f"${val:,}" if val is not None else "N/A"
-                cnt = item.get("sales_count")
-                cnt_str = f" ({cnt:,} sales)" if cnt else ""
-                lines.append(f"  {i}. {item.get('label', '?')}: {val_str}{cnt_str}")
-            lines.append("")
-
-        if "trend" in result:
-            trend = result["trend"]
-            lines.append(f"**Price Trend** (townships: {trend.get('townships', '?')}):")
-            for pt in trend.get("data_points", []):
-                lines.append(
-                    f"  {pt['year']}: avg ${pt['avg_price']:,}  ({pt['total_sales']:,} sales)"
-                )
-            lines.append("")
-
-        return "\n".join(lines)
+        # Generator + single join: no list growth, and the per-area field
+        # branches collapse into a walk over _AREA_FIELDS
+        def _lines():
+            yield "🏠 **Property Sales Data**"
+            yield f"Source: {result.get('data_source', '?')}"
+            if "year" in result:
+                yield f"Year: {result['year']}"
+            yield f"Granularity: {result.get('granularity', '?')}"
+            yield ""
+
+            if "area_data" in result:
+                for area in result["area_data"]:
+                    yield f"### {area.get('label', '?')}"
+                    for key, label, fmt in _AREA_FIELDS:
+                        val = area.get(key)
+                        if val is not None:
+                            yield f"  {label}: {fmt.format(val)}"
+                    yield ""
+
+            if "ranking" in result:
+                ranking = result["ranking"]
+                yield f"**Ranking by {ranking.get('ranked_by', '?')} (Top {ranking.get('top_n', '?')}):**"
+                for i, item in enumerate(ranking.get("items", []), 1):
+                    val = item.get("value")
+                    val_str = f"${val:,}" if val is not None else "N/A"
+                    cnt = item.get("sales_count")
+                    cnt_str = f" ({cnt:,} sales)" if cnt else ""
+                    yield f"  {i}. {item.get('label', '?')}: {val_str}{cnt_str}"
+                yield ""
+
+            if "trend" in result:
+                trend = result["trend"]
+                yield f"**Price Trend** (townships: {trend.get('townships', '?')}):"
+                for pt in trend.get("data_points", []):
+                    yield f"  {pt['year']}: avg ${pt['avg_price']:,}  ({pt['total_sales']:,} sales)"
+                yield ""
+
+        return "\n".join(_lines())
+
+
+# metric -> handler dispatch for query_property_values; unknown metrics
+# fall back to the full "all" view
+_METRIC_HANDLERS = {
+    "price_trend": PropertyDataMCP._query_trend,
+    "trend": PropertyDataMCP._query_trend,
+    "sales_volume": PropertyDataMCP._query_sales_volume,
+    "avg_price": PropertyDataMCP._query_avg_price,
+    "all": PropertyDataMCP._query_all,
+}
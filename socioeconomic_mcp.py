@@ -61,7 +61,8 @@ class SocioeconomicDataMCP(BaseDataDomain):
             self._name_to_num[name.lower()] = int(num_str)
         for alias, num in self._ca_lookup.get("aliases", {}).items():
             self._name_to_num[alias.lower()] = int(num)
-        self.load_data()
+        # Data loads lazily on the first tool call
+        self._load_attempted = False
 
     # ------------------------------------------------------------------
     # BaseDataDomain interface
@@ -71,8 +72,14 @@ class SocioeconomicDataMCP(BaseDataDomain):
     def domain_name(self) -> str:
         return "socioeconomic"
 
+    def _ensure_loaded(self) -> None:
+        """Trigger the data load on first use (at most one attempt)."""
+        if self.df is None and not self._load_attempted:
+            self.load_data()
+
     def load_data(self, **kwargs) -> bool:
         try:
+            self._load_attempted = True
             self.df = self.fetcher.fetch_all_data()
             if self.df is not None and not self.df.empty:
                 self._prepare_dataframe()
@@ -127,6 +134,7 @@ class SocioeconomicDataMCP(BaseDataDomain):
         ]
 
     def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        self._ensure_loaded()
         if tool_name == "query_socioeconomic":
             return self.query_socioeconomic(
                 community_area=arguments.get("community_area"),